@@ -1,9 +1,18 @@
+import asyncio
 import subprocess
 import json
 import httpx
 import tldextract
 import re
 import os
+from urllib.parse import urljoin
+
+from core import http_transport
+from core.html_extract import extract_scripts
+from core.js_cache import get_js_cache
+
+JS_FETCH_CONCURRENCY = 16
+JS_TIMEOUT = 10
 
 def run_cmd(cmd):
     try:
@@ -24,7 +33,7 @@ def get_headers(target):
         return {}
 
 def extract_js_files(html):
-    return re.findall(r'<script.+?src="([^"]+)"', html)
+    return extract_scripts(html)
 
 def extract_endpoints(js_code):
     return re.findall(r'/[a-zA-Z0-9/_-]{4,}', js_code)
@@ -44,6 +53,41 @@ def find_admin_panels(html):
             found.append(p)
     return found
 
+async def _fetch_js(url, sem):
+    async with sem:
+        try:
+            r = await http_transport.aget(url, timeout=JS_TIMEOUT)
+            return r.text if r.status_code == 200 else ""
+        except Exception:
+            return ""
+
+async def _analyse_js_files(target, js_files):
+    base = f"http://{target}/"
+    urls = list(dict.fromkeys(urljoin(base, js) for js in js_files))
+    sem = asyncio.Semaphore(JS_FETCH_CONCURRENCY)
+    cache = get_js_cache()
+    endpoints = {}
+
+    try:
+        for fut in asyncio.as_completed([_fetch_js(u, sem) for u in urls]):
+            code = await fut
+            if code:
+                for ep in cache.analyse(code, extract_endpoints):
+                    endpoints[ep] = True
+    finally:
+        await http_transport.aclose()
+
+    return list(endpoints)
+
+def analyse_js_files(target, js_files):
+    """
+    Fetch scripts concurrently and extract endpoints file by file.
+    Results are cached per content hash, so shared bundles are parsed once.
+    """
+    if not js_files:
+        return []
+    return asyncio.run(_analyse_js_files(target, js_files))
+
 def active_recon(target):
     result = {}
 
@@ -52,20 +96,7 @@ def active_recon(target):
     result["admin_hits"] = find_admin_panels(html)
 
     js_files = extract_js_files(html)
-    js_all = ""
-    endpoints = []
-
-    for js in js_files:
-        try:
-            if js.startswith("http"):
-                code = httpx.get(js).text
-            else:
-                code = httpx.get(f"http://{target}/{js}").text
-            js_all += code
-        except:
-            pass
-
-    result["js_endpoints"] = extract_endpoints(js_all)
+    result["js_endpoints"] = analyse_js_files(target, js_files)
     result["ports"] = nmap_scan(target)
 
     return result
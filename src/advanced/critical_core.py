@@ -5,13 +5,16 @@
 # ==========================================================
 
 import os
-import json
 import time
 import hashlib
 import threading
 from datetime import datetime
 
-CORE_DB = "data/logs/core_state.json"
+from core.checkpoint import ResumeLedger
+from core.state_store import get_state_store
+
+CORE_DB = "data/logs/core_state.json"      # legacy, imported once into the state store
+CORE_LEDGER = "data/state/core_ledger.jsonl"
 
 
 class CriticalCore:
@@ -23,47 +26,49 @@ class CriticalCore:
     - Ensures ZERO loss scanning even if GitHub Actions stops
     """
 
-    def __init__(self):
+    def __init__(self, ledger=None):
+        self.store = get_state_store()
+        self.ledger = ledger or ResumeLedger(CORE_LEDGER)
         self.state = self.load_state()
 
     def load_state(self):
         """Load system last-known state."""
-        if not os.path.exists(CORE_DB):
-            return {
-                "last_target": None,
-                "last_module": None,
-                "last_vuln": None,
-                "timestamp": None
-            }
-        try:
-            with open(CORE_DB, "r") as f:
-                return json.load(f)
-        except:
-            return {
-                "last_target": None,
-                "last_module": None,
-                "last_vuln": None,
-                "timestamp": None
-            }
+        state = {
+            "last_target": None,
+            "last_module": None,
+            "last_vuln": None,
+            "timestamp": None
+        }
+        state.update(self.store.load_namespace("core", CORE_DB))
+        return state
 
     def save_state(self):
         """Save system progress."""
-        os.makedirs(os.path.dirname(CORE_DB), exist_ok=True)
-        with open(CORE_DB, "w") as f:
-            json.dump(self.state, f, indent=4)
+        self.store.set_many("core", self.state)
 
     def update(self, key, value):
-        """Update state key."""
+        """Update state key (only the changed rows are written)."""
         self.state[key] = value
         self.state["timestamp"] = str(datetime.utcnow())
-        self.save_state()
+        self.store.set_many("core", {key: value, "timestamp": self.state["timestamp"]})
+
+    def _advance(self):
+        """The position being left behind is finished: a restart may skip it."""
+        target, module = self.state.get("last_target"), self.state.get("last_module")
+        if target is not None and module is not None:
+            self.ledger.record(target, module, "done")
 
     def record_target(self, target):
         """Record last processed target."""
+        if target != self.state.get("last_target"):
+            self._advance()
+            self.update("last_module", None)
         self.update("last_target", target)
 
     def record_module(self, module):
         """Record last running module."""
+        if module != self.state.get("last_module"):
+            self._advance()
         self.update("last_module", module)
 
     def record_vuln(self, vuln):
@@ -118,26 +123,10 @@ class AutoResumeEngine:
     def should_skip(self, target, module):
         """
         Decide if this run already passed this stage.
-        Used to skip old progress.
+        Used to skip old progress (the exact resume point is not skipped).
         """
-        resume = self.core.get_resume_info()
-
-        if resume["last_target"] is None:
-            return False  # fresh run
-
-        # If we already passed this target+module, skip
-        if target == resume["last_target"] and module == resume["last_module"]:
-            return False  # This is EXACT point of resume → DO NOT SKIP
-
-        # If target < last_target alphabetically → skip
-        if target < resume["last_target"]:
-            return True
-
-        # If same target but module < last_module → skip
-        if target == resume["last_target"] and module < resume["last_module"]:
-            return True
-
-        return False
+        ledger = self.core.ledger
+        return ledger.is_done(target) or ledger.is_done(target, module)
 
 
 # ==========================================================
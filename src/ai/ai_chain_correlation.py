@@ -4,9 +4,10 @@
 #  Built exclusively for Themoralhack 🐺🔥
 # ======================================================================
 
-import re
 from typing import List, Dict
 
+from core.signature_matcher import SignatureMatcher
+
 
 class AIChainCorrelation:
 
@@ -25,6 +26,7 @@ class AIChainCorrelation:
         r"token not required",
         r"authentication skipped",
     ]
+    _zero_day_matcher = SignatureMatcher({"zero-day": ZERO_DAY_PATTERNS})
 
     # ==================================================================
     # 2 — High-Value Correlation Rules
@@ -43,11 +45,7 @@ class AIChainCorrelation:
     # 3 — Detect Zero-Day Signals
     # ==================================================================
     def detect_zero_day(self, text: str) -> bool:
-        text = text.lower()
-        for zd in self.ZERO_DAY_PATTERNS:
-            if re.search(zd, text):
-                return True
-        return False
+        return self._zero_day_matcher.matches(text)
 
     # ==================================================================
     # 4 — Run Correlation Rules
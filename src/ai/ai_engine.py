@@ -1,18 +1,14 @@
 import hashlib
 from .severity_classifier import classify_severity
 from ..poc.poc_builder import build_poc_report
+from core.dedupe_store import get_dedupe_store
 
-ALREADY_REPORTED_DB = "data/reported_hashes.txt"
-
-def load_reported():
-    if not os.path.exists(ALREADY_REPORTED_DB):
-        return set()
-    with open(ALREADY_REPORTED_DB, "r") as f:
-        return set(line.strip() for line in f.readlines())
+def is_reported(h):
+    return get_dedupe_store().contains(h)
 
 def save_report_hash(h):
-    with open(ALREADY_REPORTED_DB, "a") as f:
-        f.write(h + "\n")
+    """True if this call recorded the hash (False: someone already had)."""
+    return get_dedupe_store().add(h)
 
 def generate_vuln_hash(target, vuln_data):
     base = target + str(vuln_data)
@@ -29,16 +25,16 @@ def ai_analyze_vulnerability(target, vuln_data):
     }
     """
 
-    # 1) HASH → Check duplicates
+    # 1) HASH → Check duplicates (cheap pre-check; step 4 is authoritative)
     hashv = generate_vuln_hash(target, vuln_data)
-    reported = load_reported()
+    duplicate = {
+        "duplicate": True,
+        "severity": "NONE",
+        "report": None
+    }
 
-    if hashv in reported:
-        return {
-            "duplicate": True,
-            "severity": "NONE",
-            "report": None
-        }
+    if is_reported(hashv):
+        return duplicate
 
     # 2) CLASSIFY severity
     severity, vrt_category = classify_severity(vuln_data["type"], vuln_data["response"])
@@ -54,8 +50,9 @@ def ai_analyze_vulnerability(target, vuln_data):
         severity=severity
     )
 
-    # 4) Save hash
-    save_report_hash(hashv)
+    # 4) Save hash — atomic, so of two concurrent workers only one reports it
+    if not save_report_hash(hashv):
+        return duplicate
 
     return {
         "duplicate": False,
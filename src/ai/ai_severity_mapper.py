@@ -4,13 +4,13 @@
 #  Built for Themoralhack 🐺🔥
 # ======================================================================
 
-import re
+from core.signature_matcher import SignatureMatcher
 
 
 class SeverityMapper:
 
     # ==================================================================
-    # 1 - Machine-Learned Keyword Patterns
+    # 1 - Machine-Learned Keyword Patterns (plain substrings)
     # ==================================================================
     PATTERNS = {
         "CRITICAL": [
@@ -50,6 +50,7 @@ class SeverityMapper:
             r"server version leak"
         ]
     }
+    _severity_matcher = SignatureMatcher(PATTERNS)
 
     # ==================================================================
     # 2 - HackerOne VRT Mapping
@@ -70,29 +71,20 @@ class SeverityMapper:
         "token leak": "Information Disclosure → Sensitive Token Leak",
         "server version leak": "Information Disclosure → Server Version"
     }
+    _vrt_matcher = SignatureMatcher({k: [k] for k in VRT_MAP})
 
     # ==================================================================
     # 3 - Detect Severity from Description
     # ==================================================================
     def detect_severity(self, text: str) -> str:
-        text = text.lower()
-
-        for level, patterns in self.PATTERNS.items():
-            for p in patterns:
-                if re.search(p, text):
-                    return level
-        return "LOW"
+        return self._severity_matcher.first_category(text, "LOW")
 
     # ==================================================================
     # 4 - Auto-map to HackerOne VRT
     # ==================================================================
     def map_vrt(self, text: str) -> str:
-        t = text.lower()
-
-        for key, value in self.VRT_MAP.items():
-            if key in t:
-                return value
-        return "General Vulnerability"
+        key = self._vrt_matcher.first_category(text)
+        return self.VRT_MAP[key] if key else "General Vulnerability"
 
     # ==================================================================
     # 5 - Full Analysis Function (Used by Main Controller)
@@ -1,26 +1,39 @@
+from core.signature_matcher import SignatureMatcher
+
+ZERODAY_SIGNALS = SignatureMatcher({
+    "ssrf": ["aws", "169.254", "metadata"],
+    "sqli": ["syntax", "mysql", "unexpected"],
+    "rce": ["uid=", "root", "command not found"],
+    "oauth": ["oauth"],
+    "redirect": ["redirect"],
+    "cors": ["access-control-allow-origin"],
+})
+
+
 def predict_zeroday(vuln_type, response_body):
 
-    resp = response_body.lower()
+    # one pass over the body, then the rules are checked in priority order
+    hits = set(ZERODAY_SIGNALS.categories(response_body))
     vt = vuln_type.lower()
 
     # SSRF detection
-    if "aws" in resp or "169.254" in resp or "metadata" in resp:
+    if "ssrf" in hits:
         return "CRITICAL", "Possible SSRF → Cloud Takeover"
 
     # SQLi blind indicators
-    if "syntax" in resp or "mysql" in resp or "unexpected" in resp:
+    if "sqli" in hits:
         return "HIGH", "Blind SQL Injection Pattern"
 
     # RCE pattern
-    if "uid=" in resp or "root" in resp or "command not found" in resp:
+    if "rce" in hits:
         return "CRITICAL", "Possible Remote Code Execution"
 
     # OAuth misconfig
-    if "oauth" in resp and "redirect" in resp:
+    if "oauth" in hits and "redirect" in hits:
         return "HIGH", "OAuth Misconfiguration"
 
     # CORS Misconfig
-    if "access-control-allow-origin" in resp:
+    if "cors" in hits:
         return "MEDIUM", "CORS Misconfiguration"
 
     return "NONE", "No 0-day Indicators"
@@ -7,35 +7,47 @@
 from collections import Counter
 from datetime import datetime
 
+class StreamingAnalysis:
+    """Incremental form of run_ai_analysis_batch: feed results one at a time."""
+
+    def __init__(self):
+        self.summary = Counter()
+        self.details = []
+        self.total_urls = 0
+
+    def add(self, item):
+        self.total_urls += 1
+        if item["findings"]:
+            for f in item["findings"]:
+                self.summary[f] += 1
+            self.details.append(item)
+
+    def report(self):
+        affected_urls = len(self.details)
+        most_common = self.summary.most_common(3)
+
+        report = {
+            "timestamp": datetime.now().isoformat(),
+            "total_urls_scanned": self.total_urls,
+            "affected_urls": affected_urls,
+            "vulnerability_summary": dict(self.summary),
+            "top_vuln_types": [v for v, _ in most_common],
+            "details": self.details,
+            "analysis_comment": generate_analysis_comment(self.summary)
+        }
+
+        print(f"[📊] AI analysis complete → {affected_urls}/{self.total_urls} URLs affected.")
+        return report
+
+
 def run_ai_analysis_batch(vuln_results):
     """Aggregate and summarize vulnerability findings."""
     print("[🧠] Running AI-style analysis phase...")
 
-    summary = Counter()
-    details = []
-
+    analysis = StreamingAnalysis()
     for item in vuln_results:
-        if item["findings"]:
-            for f in item["findings"]:
-                summary[f] += 1
-            details.append(item)
-
-    total_urls = len(vuln_results)
-    affected_urls = len(details)
-    most_common = summary.most_common(3)
-
-    report = {
-        "timestamp": datetime.now().isoformat(),
-        "total_urls_scanned": total_urls,
-        "affected_urls": affected_urls,
-        "vulnerability_summary": dict(summary),
-        "top_vuln_types": [v for v, _ in most_common],
-        "details": details,
-        "analysis_comment": generate_analysis_comment(summary)
-    }
-
-    print(f"[📊] AI analysis complete → {affected_urls}/{total_urls} URLs affected.")
-    return report
+        analysis.add(item)
+    return analysis.report()
 
 
 def generate_analysis_comment(summary):
@@ -6,11 +6,20 @@
 import json
 import random
 
+from core.signature_matcher import SignatureMatcher
+
 SEVERITY_KEYWORDS = {
     "critical": ["rce", "remote code", "takeover", "admin", "root", "credential leak", "database dump"],
     "high": ["sqli", "xss", "open redirect", "idor", "authentication bypass"],
     "medium": ["csrf", "information disclosure", "header misconfig", "weak token"],
 }
+SEVERITY_MATCHER = SignatureMatcher(SEVERITY_KEYWORDS)
+
+SEVERITY_SCORES = {
+    "critical": ("CRITICAL", 9.5),
+    "high": ("HIGH", 7.5),
+    "medium": ("MEDIUM", 5.5),
+}
 
 def ai_strong_classify(finding):
     """
@@ -18,28 +27,13 @@ def ai_strong_classify(finding):
     based on keywords + simulated AI model.
     """
 
-    text = (finding.get("details", "") + " " + finding.get("title", "")).lower()
-
-    # CRITICAL
-    for kw in SEVERITY_KEYWORDS["critical"]:
-        if kw in text:
-            finding["severity"] = "CRITICAL"
-            finding["cvss"] = 9.5
-            return finding
-
-    # HIGH
-    for kw in SEVERITY_KEYWORDS["high"]:
-        if kw in text:
-            finding["severity"] = "HIGH"
-            finding["cvss"] = 7.5
-            return finding
-
-    # MEDIUM
-    for kw in SEVERITY_KEYWORDS["medium"]:
-        if kw in text:
-            finding["severity"] = "MEDIUM"
-            finding["cvss"] = 5.5
-            return finding
+    text = finding.get("details", "") + " " + finding.get("title", "")
+
+    # CRITICAL → HIGH → MEDIUM, first matching level wins
+    level = SEVERITY_MATCHER.first_category(text)
+    if level:
+        finding["severity"], finding["cvss"] = SEVERITY_SCORES[level]
+        return finding
 
     # fallback
     finding["severity"] = "LOW"
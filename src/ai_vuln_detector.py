@@ -1,8 +1,13 @@
 import os
 import re
 import json
+import mmap
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+from core.signature_matcher import SignatureMatcher
+
 # ==============================================================
 #  DIGITAL SENTINEL MODULE — ai_vuln_detector.py
 #  Purpose: Analyze logs and detect potential vulnerabilities
@@ -11,6 +16,13 @@ from datetime import datetime
 LOG_DIR = "data/logs"
 OUTPUT_DIR = "data/reports"
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, f"ai_vuln_findings_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+FINDINGS_STREAM = os.path.join(OUTPUT_DIR, "ai_vuln_findings.jsonl")
+OFFSETS_FILE = "data/state/ai_vuln_offsets.json"
+
+# --- Incremental scanning ---
+CHUNK_SIZE = 8 * 1024 * 1024           # bytes per worker task
+PARALLEL_THRESHOLD = 2 * CHUNK_SIZE    # smaller appends are scanned inline
+MAX_WORKERS = os.cpu_count() or 2
 
 # --- Keyword database for initial AI pattern matching ---
 AI_SIGNATURES = {
@@ -22,20 +34,126 @@ AI_SIGNATURES = {
     "API Key Leak": ["api_key=", "Authorization:", "Bearer "],
     "Sensitive Info": ["password=", "secret=", "private_key", "token=", "aws_access_key_id"],
 }
+SIGNATURE_MATCHER = SignatureMatcher(AI_SIGNATURES)
 
 
 def scan_line_for_signatures(line):
     """Check a single line for vulnerability patterns."""
+    return SIGNATURE_MATCHER.categories(line)
+
+
+# --------------------------------------------------------------
+#  Incremental state: per-file byte offset + inode identity
+# --------------------------------------------------------------
+
+def load_offsets():
+    try:
+        with open(OFFSETS_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def save_offsets(offsets):
+    os.makedirs(os.path.dirname(OFFSETS_FILE), exist_ok=True)
+    tmp = OFFSETS_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(offsets, f)
+    os.replace(tmp, OFFSETS_FILE)
+
+
+def resume_point(st, prev):
+    """(offset, line) to resume from; restart at 0 if the file was rotated or truncated."""
+    if not prev or prev.get("dev") != st.st_dev or prev.get("ino") != st.st_ino:
+        return 0, 0
+    if st.st_size < prev.get("offset", 0):
+        return 0, 0
+    return prev["offset"], prev.get("line", 0)
+
+
+def plan_chunks(mm, start, size):
+    """
+    Split [start, size) into ~CHUNK_SIZE pieces ending on newlines.
+    A trailing partial line is left for the next run.
+    """
+    chunks = []
+    pos = start
+    while pos < size:
+        end = min(pos + CHUNK_SIZE, size)
+        nl = mm.rfind(b"\n", pos, end)
+        if nl == -1:
+            nl = mm.find(b"\n", end, size) if end < size else -1
+            if nl == -1:
+                break
+        chunks.append((pos, nl + 1))
+        pos = nl + 1
+    return chunks
+
+
+def scan_chunk(path, start, end):
+    """
+    Scan one newline-aligned byte range in a single matcher pass.
+    Returns (findings with chunk-relative line numbers, newline count).
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = mm[start:end]
+
+    text = data.decode("utf-8", errors="ignore")
+    lowered = text.lower()
+    lines = text.split("\n")
+
+    line_starts = [0]
+    for line in lowered.split("\n")[:-1]:
+        line_starts.append(line_starts[-1] + len(line) + 1)
+
+    per_line = {}
+    for category, _, pos in SIGNATURE_MATCHER.scan(lowered):
+        per_line.setdefault(bisect_right(line_starts, pos) - 1, set()).add(category)
+
+    findings = []
+    for idx in sorted(per_line):
+        findings.append({
+            "line": idx + 1,
+            "content": lines[idx].strip()[:200],
+            "detections": sorted(per_line[idx], key=SIGNATURE_MATCHER.rank.__getitem__),
+        })
+    return findings, data.count(b"\n")
+
+
+def _scan_chunk_task(args):
+    return scan_chunk(*args)
+
+
+def scan_new_bytes(path, start, base_line, pool_factory):
+    """Scan everything appended after `start`; returns (findings, new_offset, new_line)."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= start:
+            return [], start, base_line
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            chunks = plan_chunks(mm, start, size)
+
+    if not chunks:
+        return [], start, base_line
+
+    if size - start >= PARALLEL_THRESHOLD and len(chunks) > 1:
+        results = pool_factory().map(_scan_chunk_task, [(path, s, e) for s, e in chunks])
+    else:
+        results = (scan_chunk(path, s, e) for s, e in chunks)
+
     findings = []
-    for vuln_type, signatures in AI_SIGNATURES.items():
-        for sig in signatures:
-            if sig.lower() in line.lower():
-                findings.append(vuln_type)
-    return list(set(findings))
+    line = base_line
+    for chunk_findings, newlines in results:
+        for item in chunk_findings:
+            item["line"] += line
+            findings.append(item)
+        line += newlines
+
+    return findings, chunks[-1][1], line
 
 
 def run_ai_analysis():
-    """Run full analysis over all logs."""
+    """Scan only what was appended to the logs since the last run."""
     print("🧠 [INFO] AI Vulnerability Detector Running...")
 
     all_findings = []
@@ -43,31 +161,56 @@ def run_ai_analysis():
         print("[WARN] No logs found to analyze.")
         return
 
-    for root, _, files in os.walk(LOG_DIR):
-        for name in files:
-            if not name.endswith((".log", ".txt")):
-                continue
-            path = os.path.join(root, name)
-            try:
-                with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                    for i, line in enumerate(f, start=1):
-                        hits = scan_line_for_signatures(line)
-                        if hits:
-                            all_findings.append({
-                                "file": name,
-                                "line": i,
-                                "content": line.strip()[:200],
-                                "detections": hits
-                            })
-            except Exception as e:
-                print(f"[WARN] Failed to scan {path}: {e}")
-
     os.makedirs(OUTPUT_DIR, exist_ok=True)
+    offsets = load_offsets()
+    seen_paths = set()
+    pool = None
+
+    def pool_factory():
+        nonlocal pool
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+        return pool
+
+    try:
+        with open(FINDINGS_STREAM, "a", encoding="utf-8") as stream:
+            for root, _, files in os.walk(LOG_DIR):
+                for name in files:
+                    if not name.endswith((".log", ".txt")):
+                        continue
+                    path = os.path.join(root, name)
+                    seen_paths.add(path)
+                    try:
+                        st = os.stat(path)
+                        start, base_line = resume_point(st, offsets.get(path))
+                        findings, offset, line = scan_new_bytes(path, start, base_line, pool_factory)
+                    except Exception as e:
+                        print(f"[WARN] Failed to scan {path}: {e}")
+                        continue
+
+                    for item in findings:
+                        item["file"] = name
+                        stream.write(json.dumps(item) + "\n")
+                    stream.flush()
+                    all_findings.extend(findings)
+
+                    offsets[path] = {"dev": st.st_dev, "ino": st.st_ino,
+                                     "offset": offset, "line": line}
+                    save_offsets(offsets)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # forget files that no longer exist
+    for path in list(offsets):
+        if path not in seen_paths:
+            del offsets[path]
+    save_offsets(offsets)
 
     if not all_findings:
-        print("[INFO] No vulnerabilities detected ✅")
+        print("[INFO] No new vulnerabilities detected ✅")
     else:
-        print(f"[INFO] {len(all_findings)} potential findings detected ⚠️")
+        print(f"[INFO] {len(all_findings)} new potential findings detected ⚠️")
 
     report = {
         "generated_at": datetime.now().isoformat(),
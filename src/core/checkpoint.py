@@ -1,24 +1,178 @@
 import json
 import os
+import threading
+import time
 
-class CheckpointManager:
+# ===============================
+# Append-only resume ledger
+# ===============================
+# One JSON record per line:
+#   {"target": ..., "stage": ..., "status": ..., "ref": ..., "ts": ...}
+# The latest record for a (target, stage) pair wins. An in-memory
+# index answers "is this done?" in O(1); the file is compacted to one
+# line per pair once enough superseded lines pile up.
 
-    def __init__(self, filename="checkpoint.json"):
+TARGET_DONE = "__target__"
+
+
+class ResumeLedger:
+
+    def __init__(self, filename="data/state/resume_ledger.jsonl", compact_every=1000):
         self.filename = filename
+        self.compact_every = compact_every
+        self.lock = threading.Lock()
+        self.records = {}      # target → {stage: latest record}
+        self.live = 0
+        self.completed = set()
+        self.appended = 0
+
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        self._replay()
+        self.fh = open(self.filename, "a", encoding="utf-8")
 
+    def _replay(self):
         if not os.path.exists(self.filename):
-            with open(self.filename, "w") as f:
-                json.dump({"completed": []}, f)
+            return
+        with open(self.filename, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn last line after a kill
+                self._index(rec)
+                self.appended += 1
 
-    def load(self):
+    def _index(self, rec):
+        stages = self.records.setdefault(rec["target"], {})
+        if rec["stage"] not in stages:
+            self.live += 1
+        stages[rec["stage"]] = rec
+        if rec["stage"] == TARGET_DONE:
+            if rec["status"] == "done":
+                self.completed.add(rec["target"])
+            else:
+                self.completed.discard(rec["target"])
+
+    def record(self, target, stage, status="done", result_ref=None):
+        rec = {"target": target, "stage": stage, "status": status,
+               "ref": result_ref, "ts": time.time()}
+        with self.lock:
+            self.fh.write(json.dumps(rec) + "\n")
+            self.fh.flush()
+            self._index(rec)
+            self.appended += 1
+            if self.appended - self.live > self.compact_every:
+                self._compact()
+        return rec
+
+    # --- queries ---
+    def get(self, target, stage):
+        return self.records.get(target, {}).get(stage)
+
+    def is_done(self, target, stage=TARGET_DONE):
+        rec = self.get(target, stage)
+        return rec is not None and rec["status"] == "done"
+
+    def result_ref(self, target, stage):
+        rec = self.get(target, stage)
+        return rec["ref"] if rec else None
+
+    def stages_done(self, target):
+        return {s for s, r in self.records.get(target, {}).items()
+                if s != TARGET_DONE and r["status"] == "done"}
+
+    # --- target level ---
+    def mark_target_done(self, target, result_ref=None):
+        return self.record(target, TARGET_DONE, "done", result_ref)
+
+    def completed_targets(self):
+        return set(self.completed)
+
+    # --- maintenance ---
+    def _compact(self):
+        tmp = self.filename + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for stages in self.records.values():
+                for rec in stages.values():
+                    f.write(json.dumps(rec) + "\n")
+        self.fh.close()
+        os.replace(tmp, self.filename)
+        self.fh = open(self.filename, "a", encoding="utf-8")
+        self.appended = self.live
+
+    def compact(self):
+        with self.lock:
+            self._compact()
+
+    def reset(self):
+        """Forget everything (start of a fresh cycle)."""
+        with self.lock:
+            self.records.clear()
+            self.completed.clear()
+            self.live = 0
+            self._compact()
+
+    def apply(self, records):
+        """Append records produced elsewhere (e.g. by a pool worker)."""
+        for rec in records:
+            self.record(rec["target"], rec["stage"], rec["status"], rec.get("ref"))
+
+    def close(self):
+        with self.lock:
+            self.fh.close()
+
+
+class RecordBuffer:
+    """
+    Ledger stand-in for worker processes: nothing counts as done (every
+    stage reruns) and records are only collected, so the parent process
+    stays the single writer of the real ledger via ResumeLedger.apply().
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, target, stage, status="done", result_ref=None):
+        rec = {"target": target, "stage": stage, "status": status,
+               "ref": result_ref, "ts": time.time()}
+        self.records.append(rec)
+        return rec
+
+    def is_done(self, target, stage=TARGET_DONE):
+        return False
+
+    def result_ref(self, target, stage):
+        return None
+
+    def mark_target_done(self, target, result_ref=None):
+        return self.record(target, TARGET_DONE, "done", result_ref)
+
+
+# ===============================
+# Target-level checkpoint (legacy face)
+# ===============================
+
+class CheckpointManager(ResumeLedger):
+
+    def __init__(self, filename="checkpoint.json"):
+        self.legacy_file = filename
+        super().__init__(os.path.splitext(filename)[0] + ".ledger.jsonl")
+        self._import_legacy()
+
+    def _import_legacy(self):
+        """Fold targets from an old {"completed": [...]} checkpoint into the ledger."""
+        if self.records or not os.path.exists(self.legacy_file):
+            return
         try:
-            with open(self.filename, "r") as f:
-                return json.load(f)
-        except:
-            return None
+            with open(self.legacy_file, "r") as f:
+                completed = json.load(f).get("completed", [])
+        except Exception:
+            return
+        for target in completed:
+            self.mark_target_done(target)
+
+    def load(self):
+        return {"completed": sorted(self.completed)}
 
     def update_completed(self, target):
-        data = self.load()
-        data["completed"].append(target)
-        with open(self.filename, "w") as f:
-            json.dump(data, f, indent=4)
+        self.mark_target_done(target)
@@ -0,0 +1,99 @@
+# ==========================================================
+#  Digital Sentinel – Run Deadline
+#  CI jobs are killed at `timeout-minutes`; engines share one
+#  run-level deadline so they can budget stages, stop admitting
+#  targets that cannot finish in time, and flush results and
+#  checkpoints while there is still time to do it.
+#  - SENTINEL_DEADLINE_AT : absolute unix time the run must end by
+#  - SENTINEL_RUN_MINUTES : or a budget counted from process start
+#  Neither set → no deadline (everything below becomes a no-op).
+# ==========================================================
+
+import os
+import time
+import threading
+
+FLUSH_RESERVE = float(os.getenv("SENTINEL_FLUSH_RESERVE", "60"))   # seconds kept for saving
+DEFAULT_TARGET_COST = 120.0                                        # first guess, refined by EWMA
+EWMA_ALPHA = 0.3
+
+
+class RunDeadline:
+
+    def __init__(self, deadline_at=None, flush_reserve=FLUSH_RESERVE):
+        self.deadline_at = deadline_at
+        self.flush_reserve = flush_reserve
+
+    @classmethod
+    def from_env(cls):
+        at = os.getenv("SENTINEL_DEADLINE_AT")
+        minutes = os.getenv("SENTINEL_RUN_MINUTES")
+        if at:
+            return cls(float(at))
+        if minutes:
+            return cls(time.time() + float(minutes) * 60)
+        return cls(None)
+
+    @property
+    def enabled(self):
+        return self.deadline_at is not None
+
+    def remaining(self):
+        """Seconds left before the flush reserve (inf without a deadline)."""
+        if not self.enabled:
+            return float("inf")
+        return self.deadline_at - self.flush_reserve - time.time()
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def can_admit(self, expected_cost):
+        """True if work expected to take `expected_cost` seconds still fits."""
+        return self.remaining() >= expected_cost
+
+    def budget(self, stage_timeout=None):
+        """A stage timeout capped to the time that is left (None = unbounded)."""
+        if not self.enabled:
+            return stage_timeout
+        left = max(1.0, self.remaining())
+        return min(stage_timeout, left) if stage_timeout else left
+
+    def call_at_flush(self, callback):
+        """Run callback once the flush reserve is reached; returns the timer (or None)."""
+        if not self.enabled:
+            return None
+        timer = threading.Timer(max(0.0, self.remaining()), callback)
+        timer.daemon = True
+        timer.start()
+        return timer
+
+
+class CostEstimator:
+    """EWMA of observed per-target wall time."""
+
+    def __init__(self, initial=DEFAULT_TARGET_COST, alpha=EWMA_ALPHA):
+        self.estimate = initial
+        self.alpha = alpha
+        self.samples = 0
+        self.lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self.lock:
+            if self.samples == 0:
+                self.estimate = seconds
+            else:
+                self.estimate = self.alpha * seconds + (1 - self.alpha) * self.estimate
+            self.samples += 1
+
+
+_run_deadline = None
+_run_lock = threading.Lock()
+
+
+def get_run_deadline():
+    """Process-wide deadline, read from the environment once."""
+    global _run_deadline
+    with _run_lock:
+        if _run_deadline is None:
+            _run_deadline = RunDeadline.from_env()
+        return _run_deadline
@@ -0,0 +1,135 @@
+# ==========================================================
+#  Digital Sentinel – Reported-Finding Dedupe Store
+#  One persistent hash store shared by every worker process:
+#  - SQLite (WAL) table with a primary-key index → O(1) lookups,
+#    atomic check-and-insert across concurrent writers
+#  - in-memory Bloom filter in front, so the common "never seen"
+#    case is answered without touching the database
+# ==========================================================
+
+import os
+import math
+import time
+import sqlite3
+import hashlib
+import threading
+
+DEDUPE_DB = "data/state/reported_hashes.db"
+LEGACY_REPORTED_FILE = "data/reported_hashes.txt"
+EXPECTED_ITEMS = 1_000_000
+FALSE_POSITIVE_RATE = 0.001
+SYNC_INTERVAL = 5.0          # seconds between pulls of other processes' inserts
+
+
+class BloomFilter:
+
+    def __init__(self, expected_items=EXPECTED_ITEMS, fp_rate=FALSE_POSITIVE_RATE):
+        self.size = max(8, int(-expected_items * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / expected_items * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class DedupeStore:
+    """
+    Hashes live under a `scope` ("reported", "reward", ...) so different
+    fingerprint families never collide.
+    """
+
+    def __init__(self, path=DEDUPE_DB, expected_items=EXPECTED_ITEMS):
+        self.path = path
+        self.pid = os.getpid()
+        self.lock = threading.Lock()
+        self.bloom = BloomFilter(expected_items)
+        self.last_rowid = 0
+        self.last_sync = 0.0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS reported (
+                scope TEXT NOT NULL,
+                hash  TEXT NOT NULL,
+                PRIMARY KEY (scope, hash)
+            )
+        """)
+        self.db.commit()
+        self._import_legacy()
+        self._sync()
+
+    def _import_legacy(self):
+        """One-time import of the old append-only data/reported_hashes.txt."""
+        if not os.path.exists(LEGACY_REPORTED_FILE):
+            return
+        if self.db.execute("SELECT 1 FROM reported LIMIT 1").fetchone():
+            return
+        with open(LEGACY_REPORTED_FILE, "r") as f:
+            rows = [("reported", line.strip()) for line in f if line.strip()]
+        self.db.executemany("INSERT OR IGNORE INTO reported VALUES (?, ?)", rows)
+        self.db.commit()
+
+    def _sync(self):
+        """Pull rows written by other processes since the last sync into the Bloom filter."""
+        rows = self.db.execute(
+            "SELECT rowid, scope, hash FROM reported WHERE rowid > ? ORDER BY rowid",
+            (self.last_rowid,),
+        ).fetchall()
+        for rowid, scope, h in rows:
+            self.bloom.add(f"{scope}:{h}")
+            self.last_rowid = rowid
+        self.last_sync = time.monotonic()
+
+    def contains(self, h, scope="reported"):
+        """
+        A Bloom miss is answered from memory. Inserts by other processes
+        reach the filter within SYNC_INTERVAL; add() stays the atomic check.
+        """
+        key = f"{scope}:{h}"
+        with self.lock:
+            if time.monotonic() - self.last_sync >= SYNC_INTERVAL:
+                self._sync()
+            if key not in self.bloom:
+                return False
+            return self.db.execute(
+                "SELECT 1 FROM reported WHERE scope = ? AND hash = ?", (scope, h)
+            ).fetchone() is not None
+
+    def add(self, h, scope="reported"):
+        """Insert a hash; returns True if it was new (atomic across processes)."""
+        with self.lock:
+            cur = self.db.execute(
+                "INSERT OR IGNORE INTO reported VALUES (?, ?)", (scope, h)
+            )
+            self.db.commit()
+            self.bloom.add(f"{scope}:{h}")
+            return cur.rowcount == 1
+
+    def __contains__(self, h):
+        return self.contains(h)
+
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+
+def get_dedupe_store():
+    """Per-process store instance (re-created after fork)."""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None or _shared_store.pid != os.getpid():
+            _shared_store = DedupeStore()
+        return _shared_store
@@ -0,0 +1,221 @@
+# ==========================================================
+#  Digital Sentinel – Bulk Async DNS Resolver
+#  Resolves thousands of hostnames concurrently (A/AAAA/CNAME)
+#  and shares a TTL-respecting cache between every recon stage.
+# ==========================================================
+
+import os
+import json
+import time
+import asyncio
+import tempfile
+import threading
+
+import dns.resolver
+import dns.asyncresolver
+import dns.rdatatype
+import dns.exception
+
+DNS_CACHE_FILE = "data/cache/dns_cache.json"
+DNS_CONCURRENCY = 500
+DNS_TIMEOUT = 3.0
+MIN_TTL = 30
+MAX_TTL = 86400
+NEGATIVE_TTL = 300
+
+
+class DNSCache:
+    """
+    In-process answer cache with optional on-disk persistence.
+    Entries look like: {"a": [...], "aaaa": [...], "cname": [...], "expires": ts}
+    """
+
+    def __init__(self, path=DNS_CACHE_FILE):
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()   # one writer at a time
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return
+
+        now = time.time()
+        with self.lock:
+            for name, entry in data.items():
+                if entry.get("expires", 0) > now:
+                    self.entries[name] = entry
+
+    def save(self):
+        """Persist live entries (atomic replace, expired ones dropped)."""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with self.save_lock:
+            now = time.time()
+            with self.lock:
+                live = {n: e for n, e in self.entries.items() if e["expires"] > now}
+
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".dns_cache.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(live, f)
+                os.replace(tmp, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+
+    def get(self, name):
+        with self.lock:
+            entry = self.entries.get(name)
+            if entry and entry["expires"] > time.time():
+                return entry
+            if entry:
+                del self.entries[name]
+        return None
+
+    def put(self, name, entry):
+        with self.lock:
+            self.entries[name] = entry
+
+
+def normalize_name(name):
+    return name.strip().lower().rstrip(".")
+
+
+class AsyncDNSResolver:
+    """
+    dnspython-based asyncio resolver.
+    Pass `nameservers` / `port` to point it at a specific (or stub) server.
+    """
+
+    def __init__(self, nameservers=None, port=53, timeout=DNS_TIMEOUT,
+                 concurrency=DNS_CONCURRENCY, cache=None):
+        if nameservers:
+            self.resolver = dns.asyncresolver.Resolver(configure=False)
+            self.resolver.nameservers = list(nameservers)
+        else:
+            self.resolver = dns.asyncresolver.Resolver()
+        self.resolver.port = port
+        self.resolver.timeout = timeout
+        self.resolver.lifetime = timeout * 2
+        self.concurrency = concurrency
+        self.cache = cache if cache is not None else DNSCache()
+
+    async def _query(self, name, rdtype):
+        try:
+            return await self.resolver.resolve(name, rdtype, raise_on_no_answer=False)
+        except dns.resolver.NXDOMAIN:
+            return "nxdomain"
+        except (dns.exception.DNSException, OSError):
+            return None
+
+    async def resolve(self, name):
+        """Resolve one hostname → cache entry (cached answers are reused)."""
+        name = normalize_name(name)
+        cached = self.cache.get(name)
+        if cached:
+            return cached
+
+        a_ans, aaaa_ans = await asyncio.gather(
+            self._query(name, "A"),
+            self._query(name, "AAAA"),
+        )
+
+        entry = {"a": [], "aaaa": [], "cname": []}
+        ttls = []
+
+        for answer, key, rdtype in ((a_ans, "a", dns.rdatatype.A),
+                                    (aaaa_ans, "aaaa", dns.rdatatype.AAAA)):
+            if answer in (None, "nxdomain"):
+                continue
+            for rrset in answer.response.answer:
+                if rrset.rdtype == rdtype:
+                    entry[key].extend(r.address for r in rrset)
+                    ttls.append(rrset.ttl)
+                elif rrset.rdtype == dns.rdatatype.CNAME:
+                    for r in rrset:
+                        target = normalize_name(r.target.to_text())
+                        if target not in entry["cname"]:
+                            entry["cname"].append(target)
+                    ttls.append(rrset.ttl)
+
+        # Timeouts / SERVFAIL are not cached so the next stage can retry
+        if a_ans is None or aaaa_ans is None:
+            return entry
+
+        if ttls:
+            ttl = max(MIN_TTL, min(MAX_TTL, min(ttls)))
+        else:
+            ttl = NEGATIVE_TTL
+        entry["expires"] = time.time() + ttl
+        self.cache.put(name, entry)
+        return entry
+
+    async def resolve_many(self, names, concurrency=None):
+        """Resolve a batch concurrently → {name: entry}."""
+        sem = asyncio.Semaphore(concurrency or self.concurrency)
+        unique = list(dict.fromkeys(normalize_name(n) for n in names if n and n.strip()))
+
+        async def bounded(n):
+            async with sem:
+                return n, await self.resolve(n)
+
+        results = dict(await asyncio.gather(*(bounded(n) for n in unique)))
+        self.cache.save()
+        return results
+
+
+# ==========================================================
+# Shared instance + sync helpers
+# ==========================================================
+
+_shared_resolver = None
+_shared_lock = threading.Lock()
+
+
+def get_resolver():
+    """Process-wide resolver so every stage reuses the same cache."""
+    global _shared_resolver
+    with _shared_lock:
+        if _shared_resolver is None:
+            _shared_resolver = AsyncDNSResolver()
+        return _shared_resolver
+
+
+def first_address(entry):
+    """Pick the first IPv4 (then IPv6) address of an entry, or None."""
+    if not entry:
+        return None
+    addrs = entry.get("a") or entry.get("aaaa")
+    return addrs[0] if addrs else None
+
+
+def bulk_resolve(names, concurrency=None):
+    """Blocking bulk resolution for thread-based callers."""
+    return asyncio.run(get_resolver().resolve_many(names, concurrency))
+
+
+def resolve_host(name):
+    """Blocking single lookup → first address or None (cache first)."""
+    resolver = get_resolver()
+    cached = resolver.cache.get(normalize_name(name))
+    if cached:
+        return first_address(cached)
+    return first_address(asyncio.run(resolver.resolve(name)))
+
+
+def filter_resolvable(names, concurrency=None):
+    """Drop NXDOMAIN / address-less names from a candidate list."""
+    results = bulk_resolve(names, concurrency)
+    return [n for n in names if first_address(results.get(normalize_name(n)))]
@@ -1,10 +1,20 @@
 import os
 import json
+import queue
 import time
 import threading
 from datetime import datetime
 from .queue_manager import TaskQueue
 from .checkpoint import CheckpointManager
+from .stage_dag import StageDAG, stage_commit
+from .deadline import get_run_deadline, CostEstimator
+
+# host probes outrank new targets, so discovered work drains first
+HOST_PRIORITY = 0
+TARGET_PRIORITY = 10
+FEED_WAIT = 5          # seconds to wait for queue space before probing inline
+STAGE_TIMEOUTS = {"passive": 300, "active": 300, "shadow": 240}
+
 
 class DigitalSentinelEngine:
 
@@ -13,20 +23,14 @@ class DigitalSentinelEngine:
         self.output_dir = output_dir
         self.queue = TaskQueue(max_workers=40)
         self.checkpoint = CheckpointManager("sentinel_checkpoint.json")
+        self.pending = {}      # target → {"left", "vulns", "alive", "shadow", "started"}
+        self.deadline = get_run_deadline()
+        self.estimator = CostEstimator()
+        self.pending_lock = threading.Lock()
 
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-    # ===============================
-    # Auto Resume System
-    # ===============================
-    def load_resume_state(self):
-        saved = self.checkpoint.load()
-        if saved:
-            print("[+] Resuming from last checkpoint...")
-            return saved
-        return {}
-
     # ===============================
     # Main Start
     # ===============================
@@ -34,42 +38,129 @@ class DigitalSentinelEngine:
 
         print("\n🔥 Starting Digital Sentinel Engine v12\n")
 
-        resume_state = self.load_resume_state()
+        # finished targets are skipped; unfinished ones resume per stage (_stage)
+        completed = self.checkpoint.completed_targets()
+        if completed:
+            print("[+] Resuming from last checkpoint...")
 
         for target in self.targets:
-            if target in resume_state.get("completed", []):
+            if target in completed:
                 print(f"[+] Skipping {target}, already completed in previous scan.")
                 continue
 
             print(f"[+] Adding tasks for: {target}")
-            self.queue.add_task(lambda t=target: self.scan_target(t))
+            self.queue.add_task(lambda t=target: self.scan_target(t),
+                                priority=TARGET_PRIORITY, name=f"target:{target}")
 
         self.queue.wait_completion()
+        self.queue.close()
+        print(f"[+] Queue stats: {self.queue.stats()}")
         print("\n🏁 Scan Finished.")
 
+    # ===============================
+    # Stage-level resume
+    # ===============================
+    def _stage(self, target, name, fn):
+        """Run one stage, or reload its saved result if a previous run finished it."""
+        ref = self.checkpoint.result_ref(target, name)
+        if self.checkpoint.is_done(target, name) and ref and os.path.exists(ref):
+            print(f"[+] {target}: reusing finished stage '{name}'")
+            with open(ref, "r") as f:
+                return json.load(f)
+
+        result = fn()
+
+        stage_dir = os.path.join(self.output_dir, "stages")
+        os.makedirs(stage_dir, exist_ok=True)
+        ref = os.path.join(stage_dir, f"{target}.{name}.json")
+        with stage_commit() as live:
+            if not live:
+                print(f"[⏱] {target}: stage '{name}' finished after its timeout, result discarded")
+                return result
+            with open(ref, "w") as f:
+                json.dump(result, f)
+            self.checkpoint.record(target, name, "done", ref)
+        return result
+
     # ===============================
     # Scanner Logic
     # ===============================
     def scan_target(self, target):
 
+        if not self.deadline.can_admit(self.estimator.estimate):
+            print(f"[⏳] Skipping {target}: {self.deadline.remaining():.0f}s left, "
+                  f"~{self.estimator.estimate:.0f}s needed. Left for the next run.")
+            return
+
         print(f"🔍 Scanning Target: {target}")
+        started = time.monotonic()
 
         from ..modules.passive_recon import passive_recon
         from ..modules.active_recon import active_recon
         from ..modules.shadow_recon import shadow_recon
         from ..modules.vuln_probe import vuln_probe
 
-        # 1. Passive Recon
-        subdomains = passive_recon(target)
-
-        # 2. Active Recon
-        alive = active_recon(subdomains)
-
-        # 3. Shadow Recon Mode
-        shadow = shadow_recon(target)
-
-        # 4. Vulnerability Probing
-        vulns = vuln_probe(alive + shadow)
+        # 1. Passive → 2. Active, alongside 3. Shadow Recon Mode
+        dag = StageDAG(target)
+        dag.add("passive", lambda r: self._stage(target, "passive", lambda: passive_recon(target)),
+                timeout=self.deadline.budget(STAGE_TIMEOUTS["passive"]), default=[])
+        dag.add("active", lambda r: self._stage(target, "active", lambda: active_recon(r["passive"])),
+                deps=["passive"], timeout=self.deadline.budget(STAGE_TIMEOUTS["active"]), default=[])
+        dag.add("shadow", lambda r: self._stage(target, "shadow", lambda: shadow_recon(target)),
+                timeout=self.deadline.budget(STAGE_TIMEOUTS["shadow"]), default=[])
+        r = dag.run()
+        if dag.errors:
+            # let the queue retry; finished stages are reloaded from the ledger
+            raise RuntimeError(f"{target}: stages failed {sorted(dag.errors)}")
+        alive, shadow = r["active"], r["shadow"]
+
+        # 4. Vulnerability Probing — one queued task per discovered host
+        hosts = list(dict.fromkeys(alive + shadow))
+        with self.pending_lock:
+            self.pending[target] = {"left": len(hosts), "vulns": [],
+                                    "alive": alive, "shadow": shadow, "started": started}
+        if not hosts:
+            self._finish_target(target)
+            return
+
+        for host in hosts:
+            self.feed_host(target, host, vuln_probe)
+
+    def feed_host(self, target, host, vuln_probe):
+        """Queue a probe for a discovered host; probe inline if the queue stays full."""
+        task = lambda: self.probe_host(target, host, vuln_probe)
+        try:
+            self.queue.add_task(task, priority=HOST_PRIORITY,
+                                name=f"probe:{host}", wait=FEED_WAIT)
+        except queue.Full:
+            task()
+
+    def probe_host(self, target, host, vuln_probe):
+        # failures are recorded as a partial target rather than re-raised: a
+        # retry would count the host twice, and a host that never reports
+        # back would keep its target pending forever
+        vulns, partial = [], True
+        try:
+            if not self.deadline.expired():
+                vulns = self._stage(target, f"vulns.{host}", lambda: vuln_probe([host])) or []
+                partial = False
+        except Exception as e:
+            print(f"[⚠️] Probe failed for {host} ({target}): {e}")
+        finally:
+            with self.pending_lock:
+                state = self.pending[target]
+                state["vulns"].extend(vulns)
+                state["partial"] = state.get("partial", False) or partial
+                state["left"] -= 1
+                last = state["left"] == 0
+            if last:
+                self._finish_target(target)
+
+    def _finish_target(self, target):
+        with self.pending_lock:
+            state = self.pending.pop(target)
+        alive, shadow, vulns = state["alive"], state["shadow"], state["vulns"]
+        self.estimator.observe(time.monotonic() - state["started"])
 
         # Save
         result_path = os.path.join(self.output_dir, f"{target}.json")
@@ -79,10 +170,14 @@ class DigitalSentinelEngine:
                 "alive": alive,
                 "shadow": shadow,
                 "vulns": vulns,
+                "partial": state.get("partial", False),
                 "timestamp": str(datetime.utcnow())
             }, f, indent=4)
 
-        # Update checkpoint
-        self.checkpoint.update_completed(target)
+        # Update checkpoint (a partial target resumes from its finished host stages)
+        if state.get("partial"):
+            print(f"[⏳] Saved partial result (deadline or failed probes): {result_path}")
+            return
+        self.checkpoint.mark_target_done(target, result_path)
 
         print(f"[✓] Saved: {result_path}")
@@ -0,0 +1,91 @@
+# ==========================================================
+#  Digital Sentinel – Fast HTML Extraction
+#  Single-pass link / script / form / title extraction using
+#  lxml's streaming parser-target interface (libxml2 speed,
+#  no element tree is ever built).
+# ==========================================================
+
+from lxml import etree
+
+
+class _PageCollector:
+    """lxml parser target: receives start/end/data events and keeps only what we need."""
+
+    def __init__(self):
+        self.links = []
+        self.scripts = []
+        self.forms = []
+        self.title = None
+        self._title_parts = None
+        self._form = None
+
+    def start(self, tag, attrib):
+        if tag == "a":
+            href = attrib.get("href")
+            if href:
+                self.links.append(href.strip())
+        elif tag == "script":
+            src = attrib.get("src")
+            if src:
+                self.scripts.append(src.strip())
+        elif tag == "form":
+            self._form = {
+                "action": attrib.get("action", ""),
+                "method": attrib.get("method", "get").lower(),
+                "inputs": [],
+            }
+            self.forms.append(self._form)
+        elif tag in ("input", "textarea", "select"):
+            if self._form is not None and attrib.get("name"):
+                self._form["inputs"].append(attrib["name"])
+        elif tag == "title" and self.title is None:
+            self._title_parts = []
+
+    def end(self, tag):
+        if tag == "title" and self._title_parts is not None:
+            self.title = "".join(self._title_parts).strip()
+            self._title_parts = None
+        elif tag == "form":
+            self._form = None
+
+    def data(self, data):
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        return {
+            "links": self.links,
+            "scripts": self.scripts,
+            "forms": self.forms,
+            "title": self.title,
+        }
+
+
+def extract_page(html):
+    """
+    One pass over `html` → {"links": [...], "scripts": [...], "forms": [...], "title": str|None}
+    URLs are returned exactly as written in the page (not resolved).
+    """
+    collector = _PageCollector()
+    if not html:
+        return collector.close()
+
+    # str is fed as-is (already decoded); encoding it to bytes would make
+    # libxml2 guess the charset and mangle non-ASCII text as Latin-1
+    parser = etree.HTMLParser(target=collector, recover=True)
+    try:
+        parser.feed(html)
+        return parser.close()
+    except etree.LxmlError:
+        return collector.close()
+
+
+def extract_scripts(html):
+    return extract_page(html)["scripts"]
+
+
+def extract_title(html):
+    return extract_page(html)["title"]
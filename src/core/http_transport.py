@@ -0,0 +1,138 @@
+# ==========================================================
+#  Digital Sentinel – Shared HTTP Transport
+#  One pooled keep-alive transport for every fetching engine:
+#  connection reuse, HTTP/2 multiplexing when the server
+#  supports it, and a per-host connection cap.
+#  Sync face:  get() / request()
+#  Async face: aget() / arequest()
+# ==========================================================
+
+import asyncio
+import threading
+import weakref
+from urllib.parse import urlsplit
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_ENABLED = True
+except ImportError:
+    HTTP2_ENABLED = False
+
+USER_AGENT = "DigitalSentinel/12"
+DEFAULT_TIMEOUT = 8
+MAX_CONNECTIONS = 200
+MAX_KEEPALIVE = 100
+PER_HOST_CONNECTIONS = 6
+
+_sync_client = None
+_sync_lock = threading.Lock()
+_host_slots = {}
+
+_async_clients = weakref.WeakKeyDictionary()
+_async_host_slots = weakref.WeakKeyDictionary()
+
+
+def _client_options():
+    return {
+        "http2": HTTP2_ENABLED,
+        "follow_redirects": True,
+        "timeout": DEFAULT_TIMEOUT,
+        "headers": {"User-Agent": USER_AGENT},
+        "limits": httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE,
+        ),
+    }
+
+
+def _host_key(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+# ==========================================================
+# Sync face
+# ==========================================================
+
+def get_client():
+    """Process-wide pooled httpx.Client (thread-safe)."""
+    global _sync_client
+    with _sync_lock:
+        if _sync_client is None:
+            _sync_client = httpx.Client(**_client_options())
+        return _sync_client
+
+
+def _host_slot(url):
+    key = _host_key(url)
+    with _sync_lock:
+        slot = _host_slots.get(key)
+        if slot is None:
+            slot = _host_slots[key] = threading.BoundedSemaphore(PER_HOST_CONNECTIONS)
+        return slot
+
+
+def request(method, url, **kwargs):
+    with _host_slot(url):
+        return get_client().request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def close():
+    global _sync_client
+    with _sync_lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
+        _host_slots.clear()
+
+
+# ==========================================================
+# Async face (one client per event loop)
+# ==========================================================
+
+def get_async_client():
+    """Pooled httpx.AsyncClient bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _async_clients[loop] = httpx.AsyncClient(**_client_options())
+        _async_host_slots[loop] = {}
+    return client
+
+
+def _async_host_slot(url):
+    slots = _async_host_slots[asyncio.get_running_loop()]
+    key = _host_key(url)
+    slot = slots.get(key)
+    if slot is None:
+        slot = slots[key] = asyncio.Semaphore(PER_HOST_CONNECTIONS)
+    return slot
+
+
+async def arequest(method, url, **kwargs):
+    client = get_async_client()
+    async with _async_host_slot(url):
+        return await client.request(method, url, **kwargs)
+
+
+async def aget(url, **kwargs):
+    return await arequest("GET", url, **kwargs)
+
+
+async def aclose():
+    """Close the running loop's client (call before the loop exits)."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.pop(loop, None)
+    _async_host_slots.pop(loop, None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,217 @@
+# ==========================================================
+#  Digital Sentinel – Passive Intelligence Cache
+#  Persistent (source, query) → response cache for slow,
+#  rate-limited sources (crt.sh, WHOIS, Shodan, ...).
+#  - per-source TTLs
+#  - conditional revalidation (ETag / Last-Modified)
+#  - size-bounded LRU eviction
+#  - stale answers served when the source is down
+# ==========================================================
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+import httpx
+
+from . import http_transport
+
+INTEL_CACHE_DB = "data/cache/intel_cache.db"
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+HOUR = 3600
+SOURCE_TTLS = {
+    "crtsh": 24 * HOUR,
+    "bufferover": 24 * HOUR,
+    "whois": 7 * 24 * HOUR,
+    "shodan": 12 * HOUR,
+}
+DEFAULT_TTL = 6 * HOUR
+
+
+class CachedResponse:
+    """Minimal response object (status_code / text / headers / json())."""
+
+    def __init__(self, status_code, text, headers=None, from_cache=False):
+        self.status_code = status_code
+        self.text = text
+        self.headers = httpx.Headers(headers or {})   # case-insensitive, like a live response
+        self.from_cache = from_cache
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class IntelCache:
+
+    def __init__(self, path=INTEL_CACHE_DB, max_bytes=MAX_CACHE_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS intel (
+                source        TEXT NOT NULL,
+                query         TEXT NOT NULL,
+                body          TEXT NOT NULL,
+                content_type  TEXT,
+                etag          TEXT,
+                last_modified TEXT,
+                fetched_at    REAL NOT NULL,
+                accessed_at   REAL NOT NULL,
+                size          INTEGER NOT NULL,
+                PRIMARY KEY (source, query)
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS intel_lru ON intel (accessed_at)")
+        self.db.commit()
+        # running size total; re-summed exactly only when it says we are over
+        # the limit (other processes may have written or evicted meanwhile)
+        self.total = self._sum_sizes()
+
+    def _sum_sizes(self):
+        return self.db.execute("SELECT COALESCE(SUM(size), 0) FROM intel").fetchone()[0]
+
+    def get(self, source, query):
+        """Return the entry dict (with a `fresh` flag) or None."""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT body, content_type, etag, last_modified, fetched_at "
+                "FROM intel WHERE source = ? AND query = ?",
+                (source, query),
+            ).fetchone()
+            if row is None:
+                return None
+            self.db.execute(
+                "UPDATE intel SET accessed_at = ? WHERE source = ? AND query = ?",
+                (time.time(), source, query),
+            )
+            self.db.commit()
+
+        body, content_type, etag, last_modified, fetched_at = row
+        ttl = SOURCE_TTLS.get(source, DEFAULT_TTL)
+        return {
+            "body": body,
+            "content_type": content_type,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": fetched_at,
+            "fresh": time.time() - fetched_at < ttl,
+        }
+
+    def put(self, source, query, body, content_type=None, etag=None, last_modified=None):
+        now = time.time()
+        size = len(body.encode("utf-8"))
+        with self.lock:
+            old = self.db.execute(
+                "SELECT size FROM intel WHERE source = ? AND query = ?", (source, query)
+            ).fetchone()
+            self.db.execute(
+                "INSERT OR REPLACE INTO intel VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (source, query, body, content_type, etag, last_modified, now, now, size),
+            )
+            self.db.commit()
+            self.total += size - (old[0] if old else 0)
+            if self.total > self.max_bytes:
+                self._evict()
+
+    def touch(self, source, query):
+        """Mark an entry as revalidated (e.g. after a 304)."""
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "UPDATE intel SET fetched_at = ?, accessed_at = ? WHERE source = ? AND query = ?",
+                (now, now, source, query),
+            )
+            self.db.commit()
+
+    def evict(self):
+        """Drop least-recently-used entries until the cache fits max_bytes."""
+        with self.lock:
+            self._evict()
+
+    def _evict(self, batch=100):
+        self.total = self._sum_sizes()
+        while self.total > self.max_bytes:
+            rows = self.db.execute(
+                "SELECT source, query, size FROM intel ORDER BY accessed_at LIMIT ?", (batch,)
+            ).fetchall()
+            if not rows:
+                break
+            for source, query, size in rows:
+                if self.total <= self.max_bytes:
+                    break
+                self.db.execute(
+                    "DELETE FROM intel WHERE source = ? AND query = ?", (source, query)
+                )
+                self.total -= size
+        self.db.commit()
+
+
+# ==========================================================
+# Shared cache + cached fetch
+# ==========================================================
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_cache():
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = IntelCache()
+        return _shared_cache
+
+
+def _from_entry(entry):
+    headers = {"Content-Type": entry["content_type"]} if entry["content_type"] else {}
+    return CachedResponse(200, entry["body"], headers, from_cache=True)
+
+
+def cached_fetch(source, query, url, headers=None, timeout=30, cache=None):
+    """
+    GET `url` through the intel cache.
+    Fresh entries are returned without touching the network; stale ones are
+    revalidated with If-None-Match / If-Modified-Since, and served as-is if
+    the source errors out.
+    """
+    cache = cache or get_cache()
+    entry = cache.get(source, query)
+    if entry and entry["fresh"]:
+        return _from_entry(entry)
+
+    req_headers = dict(headers or {})
+    if entry:
+        if entry["etag"]:
+            req_headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            req_headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        r = http_transport.get(url, headers=req_headers, timeout=timeout)
+    except Exception:
+        if entry:
+            return _from_entry(entry)
+        raise
+
+    if r.status_code == 304 and entry:
+        cache.touch(source, query)
+        return _from_entry(entry)
+
+    if r.status_code == 200:
+        cache.put(
+            source, query, r.text,
+            content_type=r.headers.get("Content-Type"),
+            etag=r.headers.get("ETag"),
+            last_modified=r.headers.get("Last-Modified"),
+        )
+    elif entry:
+        return _from_entry(entry)
+
+    return CachedResponse(r.status_code, r.text, r.headers)
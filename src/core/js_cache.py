@@ -0,0 +1,87 @@
+# ==========================================================
+#  Digital Sentinel – Content-Addressed JS Analysis Cache
+#  Endpoints extracted from a script are stored under the
+#  hash of the script body, so the same jQuery / React /
+#  analytics bundle is analysed once across all targets
+#  and cycles.
+# ==========================================================
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+JS_CACHE_DB = "data/cache/js_analysis.db"
+
+
+def content_hash(code):
+    if isinstance(code, str):
+        code = code.encode("utf-8", errors="ignore")
+    return hashlib.blake2b(code, digest_size=20).hexdigest()
+
+
+class JSAnalysisCache:
+
+    def __init__(self, path=JS_CACHE_DB):
+        self.path = path
+        self.lock = threading.Lock()
+        self.memory = {}
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS js_analysis (
+                hash        TEXT PRIMARY KEY,
+                endpoints   TEXT NOT NULL,
+                size        INTEGER NOT NULL,
+                analysed_at REAL NOT NULL
+            )
+        """)
+        self.db.commit()
+
+    def get(self, h):
+        """Endpoints for a content hash, or None if never analysed."""
+        if h in self.memory:
+            return self.memory[h]
+        with self.lock:
+            row = self.db.execute(
+                "SELECT endpoints FROM js_analysis WHERE hash = ?", (h,)
+            ).fetchone()
+        if row is None:
+            return None
+        endpoints = json.loads(row[0])
+        self.memory[h] = endpoints
+        return endpoints
+
+    def put(self, h, endpoints, size=0):
+        self.memory[h] = endpoints
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO js_analysis VALUES (?, ?, ?, ?)",
+                (h, json.dumps(endpoints), size, time.time()),
+            )
+            self.db.commit()
+
+    def analyse(self, code, extractor):
+        """Return cached endpoints for `code`, running `extractor` only on a miss."""
+        h = content_hash(code)
+        endpoints = self.get(h)
+        if endpoints is None:
+            endpoints = list(dict.fromkeys(extractor(code)))
+            self.put(h, endpoints, len(code))
+        return endpoints
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_js_cache():
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = JSAnalysisCache()
+        return _shared_cache
@@ -0,0 +1,136 @@
+# ==========================================================
+#  Digital Sentinel – Streaming Stage Pipeline
+#  Phases run concurrently as worker pools joined by bounded
+#  queues: an item moves to the next stage as soon as it is
+#  produced, and a full queue blocks the stage feeding it
+#  (backpressure), so memory stays bounded by the queue sizes.
+# ==========================================================
+
+import time
+import queue
+import threading
+
+STAGE_QUEUE_SIZE = 256
+
+_DONE = object()
+
+
+class Stage:
+    """
+    fn(item) returns an iterable of outputs for the next stage
+    (an empty list drops the item, several outputs fan out).
+    """
+
+    def __init__(self, name, fn, workers=4, maxsize=STAGE_QUEUE_SIZE):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.inbox = queue.Queue(maxsize=maxsize)
+        self.processed = 0
+        self.emitted = 0
+        self.errors = 0
+        self.skipped = 0
+        self.busy_time = 0.0
+
+    def avg_time(self):
+        return self.busy_time / self.processed if self.processed else 0.0
+
+
+class Pipeline:
+
+    def __init__(self, stages, sink):
+        self.stages = stages
+        self.sink = sink
+        self.stop_event = threading.Event()
+        self.abort_event = threading.Event()
+        self.lock = threading.Lock()
+        self.sink_lock = threading.Lock()
+        self.admitted = 0
+
+    def stop(self):
+        """Stop admitting new source items; items already inside still drain."""
+        self.stop_event.set()
+
+    def abort(self):
+        """Stop admitting and skip every item still queued (fast drain)."""
+        self.stop_event.set()
+        self.abort_event.set()
+
+    @property
+    def aborted(self):
+        return self.abort_event.is_set()
+
+    # --- internals ---
+    def _worker(self, index, remaining):
+        stage = self.stages[index]
+        out = self.stages[index + 1].inbox if index + 1 < len(self.stages) else None
+
+        while True:
+            item = stage.inbox.get()
+            if item is _DONE:
+                break
+            if self.abort_event.is_set():
+                with self.lock:
+                    stage.skipped += 1
+                continue
+            start = time.monotonic()
+            try:
+                results = stage.fn(item) or []
+                for r in results:
+                    if out is not None:
+                        out.put(r)          # blocks while the next stage is behind
+                    else:
+                        with self.sink_lock:
+                            self.sink(r)
+                    with self.lock:
+                        stage.emitted += 1
+            except Exception as e:
+                with self.lock:
+                    stage.errors += 1
+                print(f"[⚠️ PIPE] {stage.name} failed on {item!r}: {e}")
+            with self.lock:
+                stage.processed += 1
+                stage.busy_time += time.monotonic() - start
+
+        # last worker out closes the next stage
+        with self.lock:
+            remaining[index] -= 1
+            last = remaining[index] == 0
+        if last and out is not None:
+            for _ in range(self.stages[index + 1].workers):
+                out.put(_DONE)
+
+    def run(self, source):
+        """Feed source items into the first stage and block until everything drained."""
+        remaining = [s.workers for s in self.stages]
+        threads = []
+        for i, stage in enumerate(self.stages):
+            for _ in range(stage.workers):
+                t = threading.Thread(target=self._worker, args=(i, remaining), daemon=True)
+                t.start()
+                threads.append(t)
+
+        first = self.stages[0].inbox
+        try:
+            for item in source:
+                if self.stop_event.is_set():
+                    break
+                first.put(item)
+                self.admitted += 1
+        finally:
+            for _ in range(self.stages[0].workers):
+                first.put(_DONE)
+            for t in threads:
+                t.join()
+        return self.stats()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "admitted": self.admitted,
+                "aborted": self.aborted,
+                "stages": {s.name: {"processed": s.processed, "emitted": s.emitted,
+                                    "errors": s.errors, "skipped": s.skipped,
+                                    "busy_time": round(s.busy_time, 2)}
+                           for s in self.stages},
+            }
@@ -0,0 +1,112 @@
+# ==========================================================
+#  Digital Sentinel – Async Connect-Scan Engine
+#  One shared TCP connect scanner for every recon stage:
+#  bounded global concurrency across hosts × ports, per-host
+#  socket limits and structured per-port results.
+# ==========================================================
+
+import asyncio
+import ipaddress
+import time
+
+from .dns_resolver import get_resolver, first_address
+
+COMMON_PORTS = [21, 22, 25, 53, 80, 110, 143, 443, 3306, 5432, 8080, 8443]
+SCAN_CONCURRENCY = 1000
+PER_HOST_LIMIT = 64
+CONNECT_TIMEOUT = 1.0
+
+
+class PortScanner:
+    """
+    Result per host:
+    {
+        "host": "example.com",
+        "ip": "93.184.216.34",
+        "ports": {80: "open", 22: "filtered", 21: "closed"},
+        "open_ports": [80],
+        "rtt": {80: 0.031},
+        "duration": 0.42
+    }
+    """
+
+    def __init__(self, concurrency=SCAN_CONCURRENCY, per_host=PER_HOST_LIMIT,
+                 timeout=CONNECT_TIMEOUT):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+
+    async def _probe(self, ip, port, global_sem, host_sem):
+        async with global_sem, host_sem:
+            start = time.time()
+            try:
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(ip, port), timeout=self.timeout
+                )
+            except asyncio.TimeoutError:
+                return port, "filtered", None
+            except ConnectionRefusedError:
+                return port, "closed", None
+            except OSError:
+                return port, "filtered", None
+            rtt = round(time.time() - start, 4)
+
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+            return port, "open", rtt
+
+    async def _resolve(self, host):
+        try:
+            return str(ipaddress.ip_address(host))
+        except ValueError:
+            pass
+        return first_address(await get_resolver().resolve(host))
+
+    async def _scan_host(self, host, ports, global_sem):
+        start = time.time()
+        result = {"host": host, "ip": None, "ports": {}, "open_ports": [], "rtt": {}, "duration": 0}
+
+        ip = await self._resolve(host)
+        if not ip:
+            result["error"] = "unresolved"
+            return result
+        result["ip"] = ip
+
+        host_sem = asyncio.Semaphore(self.per_host)
+        states = await asyncio.gather(
+            *(self._probe(ip, p, global_sem, host_sem) for p in ports)
+        )
+
+        result["ports"] = {p: s for p, s, _ in states}
+        result["open_ports"] = sorted(p for p, s, _ in states if s == "open")
+        result["rtt"] = {p: rtt for p, s, rtt in states if rtt is not None}
+        result["duration"] = round(time.time() - start, 3)
+        return result
+
+    async def scan_host(self, host, ports=None):
+        sem = asyncio.Semaphore(self.concurrency)
+        return await self._scan_host(host, ports or COMMON_PORTS, sem)
+
+    async def scan_many(self, hosts, ports=None):
+        """Scan every host × port under one global concurrency bound."""
+        sem = asyncio.Semaphore(self.concurrency)
+        ports = ports or COMMON_PORTS
+        return await asyncio.gather(*(self._scan_host(h, ports, sem) for h in hosts))
+
+
+# ==========================================================
+# Sync helpers for thread-based callers
+# ==========================================================
+
+def scan_ports(host, ports=None, timeout=CONNECT_TIMEOUT):
+    """Blocking scan of a single host → structured result."""
+    return asyncio.run(PortScanner(timeout=timeout).scan_host(host, ports))
+
+
+def scan_hosts(hosts, ports=None, timeout=CONNECT_TIMEOUT, concurrency=SCAN_CONCURRENCY):
+    """Blocking scan of many hosts → list of structured results."""
+    scanner = PortScanner(concurrency=concurrency, timeout=timeout)
+    return asyncio.run(scanner.scan_many(hosts, ports))
@@ -1,36 +1,287 @@
+import heapq
+import itertools
+import math
 import queue
+import random
 import threading
 import time
+from collections import deque
+
+# ===============================
+# Defaults
+# ===============================
+MAX_QUEUED = 1000          # producers block once this many tasks are waiting
+DEFAULT_RETRIES = 2
+BACKOFF_BASE = 1.0         # seconds, doubled per attempt
+BACKOFF_MAX = 60.0
+WHEEL_TICK = 0.1
+WHEEL_SLOTS = 512
+STATS_WINDOW = 1000
+
+
+class TimerWheel:
+    """Hashed timer wheel: O(1) schedule, one thread fires due callbacks."""
+
+    def __init__(self, tick=WHEEL_TICK, slots=WHEEL_SLOTS):
+        self.tick = tick
+        self.slots = [[] for _ in range(slots)]
+        self.cursor = 0
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def schedule(self, delay, callback):
+        ticks = max(1, math.ceil(delay / self.tick))
+        # the slot `ticks` ahead is reached on tick number `ticks`; counting
+        # from ticks - 1 keeps exact multiples of the wheel size in this lap
+        rounds, offset = divmod(ticks - 1, len(self.slots))
+        with self.lock:
+            self.slots[(self.cursor + offset + 1) % len(self.slots)].append([rounds, callback])
+
+    def _advance(self):
+        """One tick: move the cursor and fire what is due in the new slot."""
+        with self.lock:
+            self.cursor = (self.cursor + 1) % len(self.slots)
+            slot = self.slots[self.cursor]
+            due = [cb for rounds, cb in slot if rounds == 0]
+            slot[:] = [[rounds - 1, cb] for rounds, cb in slot if rounds > 0]
+        for cb in due:
+            try:
+                cb()
+            except Exception as e:
+                print(f"[ERROR] Timer callback failed: {e}")
+
+    def _run(self):
+        next_tick = time.monotonic()
+        while not self.stopped.is_set():
+            next_tick += self.tick
+            self.stopped.wait(max(0.0, next_tick - time.monotonic()))
+            if not self.stopped.is_set():
+                self._advance()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+
+class Task:
+
+    __slots__ = ("func", "name", "priority", "timeout", "retries",
+                 "attempts", "submitted", "started", "finished", "status", "error")
+
+    def __init__(self, func, name, priority, timeout, retries):
+        self.func = func
+        self.name = name
+        self.priority = priority
+        self.timeout = timeout
+        self.retries = retries
+        self.attempts = 0
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.status = "queued"
+        self.error = None
+
 
 class TaskQueue:
+    """
+    Bounded priority queue with long-lived workers.
+    - add_task() blocks while MAX_QUEUED tasks are waiting (backpressure)
+    - lower priority number runs first; FIFO within a priority
+    - failed / timed-out tasks are retried with exponential backoff,
+      scheduled on a timer wheel rather than a sleeping worker
+    - workers stay up until close(), so running tasks may add new ones
+    """
 
-    def __init__(self, max_workers=20):
-        self.tasks = queue.Queue()
+    def __init__(self, max_workers=20, maxsize=MAX_QUEUED, timeout=None,
+                 retries=DEFAULT_RETRIES, backoff=BACKOFF_BASE, max_backoff=BACKOFF_MAX):
         self.max_workers = max_workers
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.heap = []
+        self.seq = itertools.count()
+        self.mutex = threading.Lock()
+        self.not_empty = threading.Condition(self.mutex)
+        self.not_full = threading.Condition(self.mutex)
+        self.idle = threading.Condition(self.mutex)
+        self.unfinished = 0        # queued + running + waiting for retry
+        self.closed = False
         self.threads = []
+        self.wheel = None
+
+        self.counts = {"submitted": 0, "succeeded": 0, "failed": 0,
+                       "retried": 0, "timeouts": 0}
+        self.durations = deque(maxlen=STATS_WINDOW)
+        self.waits = deque(maxlen=STATS_WINDOW)
+
+    # ===============================
+    # Producers
+    # ===============================
+    def add_task(self, func, priority=0, timeout=None, retries=None, name=None,
+                 block=True, wait=None):
+        """Queue func(); raises queue.Full if it cannot be queued in time."""
+        task = Task(func, name or getattr(func, "__name__", "task"), priority,
+                    self.timeout if timeout is None else timeout,
+                    self.retries if retries is None else retries)
+        with self.mutex:
+            if self.closed:
+                raise RuntimeError("TaskQueue is closed")
+            if len(self.heap) >= self.maxsize:
+                if not block or not self.not_full.wait_for(
+                        lambda: len(self.heap) < self.maxsize or self.closed, wait):
+                    raise queue.Full
+                if self.closed:
+                    raise RuntimeError("TaskQueue is closed")
+            self._push(task)
+            self.unfinished += 1
+            self.counts["submitted"] += 1
+        self.start()
+        return task
+
+    def _push(self, task):
+        heapq.heappush(self.heap, (task.priority, next(self.seq), task))
+        self.not_empty.notify()
+
+    def _requeue(self, task):
+        # retries were already admitted once, so they bypass the size bound
+        with self.mutex:
+            if self.closed:
+                task.status = "failed"
+                self.counts["failed"] += 1
+                self._task_finished()
+                return
+            task.status = "queued"
+            self._push(task)
+
+    # ===============================
+    # Workers
+    # ===============================
+    def start(self):
+        with self.mutex:
+            if self.threads:
+                return
+            self.wheel = TimerWheel()
+            for _ in range(self.max_workers):
+                t = threading.Thread(target=self.worker, daemon=True)
+                t.start()
+                self.threads.append(t)
 
     def worker(self):
         while True:
-            try:
-                task = self.tasks.get(block=False)
-            except queue.Empty:
-                break
+            with self.mutex:
+                self.not_empty.wait_for(lambda: self.heap or self.closed)
+                if not self.heap:
+                    return  # closed and drained
+                _, _, task = heapq.heappop(self.heap)
+                self.not_full.notify()
+            self._execute(task)
 
+    def _call(self, task):
+        if not task.timeout:
+            return task.func()
+        # a thread cannot be killed: on timeout the call is abandoned and
+        # the worker moves on (the task is retried or marked failed)
+        box = {}
+
+        def target():
             try:
-                task()
-            except Exception as e:
-                print(f"[ERROR] Task failed: {e}")
+                box["result"] = task.func()
+            except BaseException as e:
+                box["error"] = e
+
+        runner = threading.Thread(target=target, daemon=True)
+        runner.start()
+        runner.join(task.timeout)
+        if runner.is_alive():
+            raise TimeoutError(f"timed out after {task.timeout}s")
+        if "error" in box:
+            raise box["error"]
+        return box.get("result")
+
+    def _execute(self, task):
+        task.attempts += 1
+        task.status = "running"
+        task.started = time.time()
+        if task.attempts == 1:
+            self.waits.append(task.started - task.submitted)
+        try:
+            self._call(task)
+            error = None
+        except Exception as e:
+            error = e
+        task.finished = time.time()
+
+        with self.mutex:
+            self.durations.append(task.finished - task.started)
+            if error is None:
+                task.status = "done"
+                self.counts["succeeded"] += 1
+                self._task_finished()
+                return
+
+            task.error = error
+            if isinstance(error, TimeoutError):
+                self.counts["timeouts"] += 1
+            if task.attempts <= task.retries and not self.closed:
+                task.status = "retry"
+                self.counts["retried"] += 1
+                delay = min(self.max_backoff, self.backoff * 2 ** (task.attempts - 1))
+                delay *= random.uniform(0.8, 1.2)
+                print(f"[WARN] Task {task.name} failed ({error}); retry {task.attempts}/{task.retries} in {delay:.1f}s")
+                self.wheel.schedule(delay, lambda: self._requeue(task))
+                return
+
+            task.status = "failed"
+            self.counts["failed"] += 1
+            print(f"[ERROR] Task failed: {task.name}: {error}")
+            self._task_finished()
 
-            self.tasks.task_done()
+    def _task_finished(self):
+        self.unfinished -= 1
+        if self.unfinished == 0:
+            self.idle.notify_all()
 
-    def add_task(self, func):
-        self.tasks.put(func)
+    # ===============================
+    # Control
+    # ===============================
+    def wait_completion(self, timeout=None):
+        """Block until every queued, running and retrying task has finished."""
+        self.start()
+        with self.mutex:
+            return self.idle.wait_for(lambda: self.unfinished == 0, timeout)
 
-    def wait_completion(self):
-        for _ in range(self.max_workers):
-            t = threading.Thread(target=self.worker)
-            t.daemon = True
-            t.start()
-            self.threads.append(t)
+    def close(self, wait=True):
+        """Stop accepting tasks; workers exit once the queue is drained."""
+        if wait:
+            self.wait_completion()
+        with self.mutex:
+            self.closed = True
+            if not wait:
+                self.unfinished -= len(self.heap)
+                self.heap.clear()
+            self.not_empty.notify_all()
+            self.not_full.notify_all()
+        for t in self.threads:
+            t.join()
+        if self.wheel:
+            self.wheel.stop()
 
-        self.tasks.join()
+    def stats(self):
+        with self.mutex:
+            durations = sorted(self.durations)
+            waits = sorted(self.waits)
+            stats = dict(self.counts)
+            stats.update({
+                "queued": len(self.heap),
+                "in_flight": self.unfinished - len(self.heap),
+                "avg_time": sum(durations) / len(durations) if durations else 0.0,
+                "p95_time": durations[int(len(durations) * 0.95)] if durations else 0.0,
+                "max_time": durations[-1] if durations else 0.0,
+                "avg_wait": sum(waits) / len(waits) if waits else 0.0,
+            })
+        return stats
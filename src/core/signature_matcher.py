@@ -0,0 +1,108 @@
+# ==========================================================
+#  Digital Sentinel – Compiled Multi-Pattern Signature Matcher
+#  Compiles a {category: [literal, ...]} signature set once and
+#  reports every hit with its category in a single pass over
+#  the text.
+#  - pyahocorasick installed → Aho-Corasick automaton, O(length)
+#  - otherwise              → one combined regex (per-position
+#                             lookaheads, overlaps still reported)
+# ==========================================================
+
+import re
+
+try:
+    import ahocorasick
+    AHO_CORASICK_ENABLED = True
+except ImportError:
+    AHO_CORASICK_ENABLED = False
+
+
+class SignatureMatcher:
+    """
+    signatures = {"XSS": ["<script>", "onerror="], "SQLi": ["union select"], ...}
+    Signatures are plain substrings; matching is case-insensitive by default.
+    Category order is kept, so first_category() respects priority order.
+    """
+
+    def __init__(self, signatures, ignore_case=True, use_automaton=AHO_CORASICK_ENABLED):
+        self.ignore_case = ignore_case
+        self.categories_order = list(signatures)
+        self.rank = {c: i for i, c in enumerate(self.categories_order)}
+        self._automaton = None
+        self._regex = None
+
+        fold = (lambda s: s.lower()) if ignore_case else (lambda s: s)
+        by_pattern = {}
+        for cat, patterns in signatures.items():
+            for p in patterns:
+                if p:
+                    by_pattern.setdefault(fold(p), []).append(cat)
+
+        if not by_pattern:
+            return
+
+        if use_automaton:
+            self._automaton = ahocorasick.Automaton()
+            for p, cats in by_pattern.items():
+                self._automaton.add_word(p, (p, tuple(cats)))
+            self._automaton.make_automaton()
+        else:
+            self._compile_regex(by_pattern)
+
+    def _compile_regex(self, by_pattern):
+        def alternation(patterns):
+            return "|".join(re.escape(p) for p in sorted(patterns, key=len, reverse=True))
+
+        per_cat = {c: [] for c in self.categories_order}
+        for p, cats in by_pattern.items():
+            for c in cats:
+                per_cat[c].append(p)
+
+        self._groups = {}
+        parts = [f"(?=(?:{alternation(by_pattern)}))"]
+        for i, cat in enumerate(self.categories_order):
+            if per_cat[cat]:
+                self._groups[f"c{i}"] = cat
+                parts.append(f"(?:(?=(?P<c{i}>{alternation(per_cat[cat])})))?")
+        self._regex = re.compile("".join(parts), re.DOTALL)
+
+    def scan(self, text):
+        """Every hit as (category, matched_signature, start_offset)."""
+        if not text:
+            return []
+        if self.ignore_case:
+            text = text.lower()
+
+        hits = []
+        if self._automaton is not None:
+            for end, (p, cats) in self._automaton.iter(text):
+                start = end - len(p) + 1
+                hits.extend((c, p, start) for c in cats)
+        elif self._regex is not None:
+            for m in self._regex.finditer(text):
+                for g, value in m.groupdict().items():
+                    if value is not None:
+                        hits.append((self._groups[g], value, m.start()))
+        return hits
+
+    def categories(self, text):
+        """Unique matched categories, in signature-definition order."""
+        found = {c for c, _, _ in self.scan(text)}
+        return sorted(found, key=self.rank.__getitem__)
+
+    def first_category(self, text, default=None):
+        """Highest-priority (earliest defined) matched category."""
+        found = self.categories(text)
+        return found[0] if found else default
+
+    def matches(self, text):
+        """True as soon as any signature is found."""
+        if not text:
+            return False
+        if self.ignore_case:
+            text = text.lower()
+        if self._automaton is not None:
+            for _ in self._automaton.iter(text):
+                return True
+            return False
+        return self._regex is not None and self._regex.search(text) is not None
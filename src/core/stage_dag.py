@@ -0,0 +1,135 @@
+# ==========================================================
+#  Digital Sentinel – Per-Target Stage DAG
+#  Stages declare their dependencies; every stage whose inputs
+#  are ready runs at once, each under its own timeout, so a
+#  target takes as long as its longest branch instead of the
+#  sum of all stages.
+# ==========================================================
+
+import time
+import queue
+import threading
+from contextlib import contextmanager
+
+_local = threading.local()
+
+
+class StageToken:
+    """Per-stage-run token; once abandoned, the stage may no longer commit."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.abandoned = False
+
+    def abandon(self):
+        with self.lock:        # waits for a commit already in progress
+            self.abandoned = True
+
+
+@contextmanager
+def stage_commit():
+    """
+    Hold while persisting a stage's result (stage file, ledger record):
+        with stage_commit() as live:
+            if live: ...write...
+    `live` is False if the DAG already timed the stage out, so a late
+    result cannot overwrite the default its target moved on with.
+    Outside a DAG stage it is always True.
+    """
+    token = getattr(_local, "token", None)
+    if token is None:
+        yield True
+        return
+    with token.lock:
+        yield not token.abandoned
+
+
+class StageDAG:
+    """
+    dag = StageDAG("example.com")
+    dag.add("passive", lambda r: passive_recon(t), default={})
+    dag.add("report",  lambda r: build(r["passive"]), deps=["passive"])
+    results = dag.run()
+
+    fn(results) receives the results of every finished stage. A stage
+    that raises or runs past its timeout yields its `default`, and its
+    dependents still run (they see the default). Stages run in daemon
+    threads, so a hung stage never holds up interpreter exit.
+    """
+
+    def __init__(self, label=""):
+        self.label = label
+        self.stages = {}
+        self.timings = {}
+        self.errors = {}
+
+    def add(self, name, fn, deps=(), timeout=None, default=None):
+        for d in deps:
+            if d not in self.stages:
+                raise ValueError(f"stage '{name}' depends on unknown stage '{d}'")
+        self.stages[name] = {"fn": fn, "deps": tuple(deps),
+                             "timeout": timeout, "default": default}
+        return self
+
+    @staticmethod
+    def _call(name, fn, results, token, finished):
+        _local.token = token
+        try:
+            finished.put((name, token, True, fn(results)))
+        except Exception as e:
+            finished.put((name, token, False, e))
+
+    def run(self):
+        results = {}
+        waiting = dict(self.stages)
+        running = {}        # name → (token, started, deadline)
+        finished = queue.Queue()
+
+        while waiting or running:
+            for name in [n for n, s in waiting.items()
+                         if all(d in results for d in s["deps"])]:
+                spec = waiting.pop(name)
+                started = time.monotonic()
+                deadline = started + spec["timeout"] if spec["timeout"] else None
+                token = StageToken()
+                threading.Thread(target=self._call, daemon=True,
+                                 args=(name, spec["fn"], dict(results), token, finished)).start()
+                running[name] = (token, started, deadline)
+
+            if not running:
+                raise RuntimeError(f"unsatisfiable stages: {sorted(waiting)}")
+
+            deadlines = [d for _, _, d in running.values() if d is not None]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            done = []
+            try:
+                done.append(finished.get(timeout=timeout))
+                while True:
+                    done.append(finished.get_nowait())
+            except queue.Empty:
+                pass
+
+            for name, token, ok, value in done:
+                if name not in running or running[name][0] is not token:
+                    continue    # late result of an abandoned stage
+                _, started, _ = running.pop(name)
+                self.timings[name] = time.monotonic() - started
+                if ok:
+                    results[name] = value
+                else:
+                    self.errors[name] = value
+                    results[name] = self.stages[name]["default"]
+                    print(f"[⚠️ DAG] {self.label}: stage '{name}' failed: {value}")
+
+            now = time.monotonic()
+            for name, (token, started, deadline) in list(running.items()):
+                if deadline is not None and now >= deadline:
+                    # the thread cannot be killed: it is abandoned and may not commit
+                    token.abandon()
+                    running.pop(name)
+                    self.timings[name] = now - started
+                    self.errors[name] = TimeoutError(f"{name} exceeded {self.stages[name]['timeout']}s")
+                    results[name] = self.stages[name]["default"]
+                    print(f"[⏱ DAG] {self.label}: stage '{name}' timed out")
+
+        return results
@@ -0,0 +1,206 @@
+# ==========================================================
+#  Digital Sentinel – Embedded State Store
+#  One SQLite (WAL) database for the long-lived engine state
+#  that used to live in separate JSON files:
+#  - counters : (namespace, key) → number, updated with +=
+#  - kv       : (namespace, key) → JSON value
+#  - events   : append-only (stream, JSON payload) rows
+#  Every write touches only the rows it changes, and SQLite's
+#  locking makes it safe for concurrent worker processes.
+# ==========================================================
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+STATE_DB = "data/state/sentinel_state.db"
+BUSY_TIMEOUT = 30
+
+
+class StateStore:
+
+    def __init__(self, path=STATE_DB):
+        self.path = path
+        self.pid = os.getpid()
+        self.lock = threading.RLock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=BUSY_TIMEOUT,
+                                  check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS counters (
+                namespace TEXT NOT NULL,
+                key       TEXT NOT NULL,
+                value     NUMERIC NOT NULL DEFAULT 0,
+                PRIMARY KEY (namespace, key)
+            );
+            CREATE TABLE IF NOT EXISTS kv (
+                namespace TEXT NOT NULL,
+                key       TEXT NOT NULL,
+                value     TEXT,
+                updated   REAL,
+                PRIMARY KEY (namespace, key)
+            );
+            CREATE TABLE IF NOT EXISTS events (
+                id      INTEGER PRIMARY KEY AUTOINCREMENT,
+                stream  TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                ts      REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS events_stream ON events (stream, id);
+        """)
+
+    @contextmanager
+    def transaction(self):
+        """Group several writes into one atomic commit (BEGIN IMMEDIATE)."""
+        with self.lock:
+            if self.db.in_transaction:
+                yield self
+                return
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+            self.db.execute("COMMIT")
+
+    # --- counters ---
+    def incr(self, namespace, key, delta=1):
+        self.incr_many(namespace, {key: delta})
+
+    def incr_many(self, namespace, deltas):
+        """deltas = {key: amount}"""
+        if not deltas:
+            return
+        with self.transaction():
+            self.db.executemany(
+                "INSERT INTO counters (namespace, key, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (namespace, key) DO UPDATE SET value = value + excluded.value",
+                [(namespace, k, d) for k, d in deltas.items()],
+            )
+
+    def counter(self, namespace, key, default=0):
+        row = self._one("SELECT value FROM counters WHERE namespace = ? AND key = ?",
+                        (namespace, key))
+        return row[0] if row else default
+
+    def counters(self, namespace):
+        return dict(self._all("SELECT key, value FROM counters WHERE namespace = ?",
+                              (namespace,)))
+
+    def top(self, namespace, limit=10):
+        """Highest counters first, as [(key, value), ...]."""
+        return self._all(
+            "SELECT key, value FROM counters WHERE namespace = ? "
+            "ORDER BY value DESC, key LIMIT ?", (namespace, limit))
+
+    # --- key/value ---
+    def get(self, namespace, key, default=None):
+        row = self._one("SELECT value FROM kv WHERE namespace = ? AND key = ?",
+                        (namespace, key))
+        return json.loads(row[0]) if row else default
+
+    def set(self, namespace, key, value):
+        self.set_many(namespace, {key: value})
+
+    def set_many(self, namespace, values):
+        now = time.time()
+        with self.transaction():
+            self.db.executemany(
+                "INSERT OR REPLACE INTO kv (namespace, key, value, updated) VALUES (?, ?, ?, ?)",
+                [(namespace, k, json.dumps(v), now) for k, v in values.items()],
+            )
+
+    def items(self, namespace):
+        return {k: json.loads(v) for k, v in
+                self._all("SELECT key, value FROM kv WHERE namespace = ?", (namespace,))}
+
+    # --- event streams ---
+    def append(self, stream, payload):
+        self.append_many(stream, [payload])
+
+    def append_many(self, stream, payloads):
+        now = time.time()
+        with self.transaction():
+            self.db.executemany(
+                "INSERT INTO events (stream, payload, ts) VALUES (?, ?, ?)",
+                [(stream, json.dumps(p), now) for p in payloads],
+            )
+
+    def tail(self, stream, limit):
+        """Last `limit` payloads of a stream, oldest first."""
+        rows = self._all(
+            "SELECT payload FROM events WHERE stream = ? ORDER BY id DESC LIMIT ?",
+            (stream, limit))
+        return [json.loads(p) for (p,) in reversed(rows)]
+
+    def events(self, stream):
+        rows = self._all("SELECT payload FROM events WHERE stream = ? ORDER BY id", (stream,))
+        return [json.loads(p) for (p,) in rows]
+
+    def events_since(self, stream, after_id=0, limit=10000):
+        """New rows of a stream as [(id, payload), ...] — for incremental followers."""
+        rows = self._all(
+            "SELECT id, payload FROM events WHERE stream = ? AND id > ? ORDER BY id LIMIT ?",
+            (stream, after_id, limit))
+        return [(i, json.loads(p)) for i, p in rows]
+
+    def last_event_id(self, stream):
+        row = self._one("SELECT MAX(id) FROM events WHERE stream = ?", (stream,))
+        return row[0] or 0
+
+    def count(self, stream):
+        return self._one("SELECT COUNT(*) FROM events WHERE stream = ?", (stream,))[0]
+
+    # --- one-time import of the old JSON state files ---
+    def migrate_once(self, legacy_file, importer):
+        """Run importer(data) for a legacy JSON file exactly once across all processes."""
+        if not os.path.exists(legacy_file):
+            return False
+        with self.transaction():
+            if self.get("_migrated", legacy_file):
+                return False
+            try:
+                with open(legacy_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"[WARN] Could not import {legacy_file}: {e}")
+                data = None
+            if data is not None:
+                importer(data)
+            self.set("_migrated", legacy_file, True)
+        return True
+
+    def load_namespace(self, namespace, legacy_file=None):
+        """kv namespace as a dict, seeded once from an old flat JSON object file."""
+        if legacy_file:
+            self.migrate_once(legacy_file, lambda data: self.set_many(namespace, data))
+        return self.items(namespace)
+
+    # --- helpers ---
+    def _one(self, sql, args):
+        with self.lock:
+            return self.db.execute(sql, args).fetchone()
+
+    def _all(self, sql, args):
+        with self.lock:
+            return self.db.execute(sql, args).fetchall()
+
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+
+def get_state_store():
+    """Per-process store instance (re-created after fork)."""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None or _shared_store.pid != os.getpid():
+            _shared_store = StateStore()
+        return _shared_store
@@ -0,0 +1,118 @@
+# ==========================================================
+#  Digital Sentinel – Warm Worker Pool
+#  Pre-forked scan workers that import the scan entrypoint once
+#  and then take targets from a local queue, so every target after
+#  the first reuses the worker's imports, its sync HTTP client and its
+#  DNS cache (async clients still live per asyncio.run() call).
+#  Workers are recycled after MAX_TASKS_PER_WORKER targets to keep
+#  memory bounded.
+# ==========================================================
+
+import os
+import time
+import importlib
+import threading
+import traceback
+import multiprocessing
+
+SCAN_ENTRYPOINT = "unified_vuln_engine:scan_cycle_target"   # fresh scan, records returned
+POOL_WORKERS = int(os.getenv("SENTINEL_WORKERS", "4"))
+MAX_TASKS_PER_WORKER = int(os.getenv("SENTINEL_WORKER_MAX_TASKS", "50"))
+PRELOAD_MODULES = ("core.http_transport", "core.dns_resolver")
+
+_entry = None
+
+
+def _load_entrypoint(spec):
+    module, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+def _warm_worker(spec, preload):
+    """Runs once per worker process: pay all import costs up front."""
+    global _entry
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"[WARN] worker {os.getpid()}: preload {name} failed: {e}")
+    _entry = _load_entrypoint(spec)
+
+
+def _run_task(target):
+    start = time.time()
+    try:
+        result = _entry(target)
+        ok, error = True, None
+    except Exception as e:
+        result, ok = None, False
+        error = f"{e.__class__.__name__}: {e}\n{traceback.format_exc(limit=5)}"
+    return {"target": target, "ok": ok, "result": result, "error": error,
+            "pid": os.getpid(), "elapsed": time.time() - start}
+
+
+class WarmWorkerPool:
+    """
+    pool = WarmWorkerPool()
+    pool.submit("example.com")        # blocks while every worker is busy
+    for r in pool.drain(): ...        # finished results, non-blocking
+    pool.close()
+    """
+
+    def __init__(self, entrypoint=SCAN_ENTRYPOINT, workers=POOL_WORKERS,
+                 max_tasks=MAX_TASKS_PER_WORKER, preload=PRELOAD_MODULES):
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+        self.workers = workers
+        self.pool = ctx.Pool(processes=workers, initializer=_warm_worker,
+                             initargs=(entrypoint, tuple(preload)),
+                             maxtasksperchild=max_tasks)
+        self.slots = threading.BoundedSemaphore(workers)
+        self.lock = threading.Lock()
+        self.done = []
+        self.in_flight = 0
+
+    def _finished(self, result):
+        with self.lock:
+            self.done.append(result)
+            self.in_flight -= 1
+        self.slots.release()
+
+    def _failed(self, target, exc):
+        self._finished({"target": target, "ok": False, "result": None,
+                        "error": repr(exc), "pid": None, "elapsed": 0.0})
+
+    def submit(self, target, timeout=None):
+        """Queue a target for a warm worker; waits for a free slot (backpressure)."""
+        if not self.slots.acquire(timeout=timeout):
+            return False
+        with self.lock:
+            self.in_flight += 1
+        self.pool.apply_async(_run_task, (target,),
+                              callback=self._finished,
+                              error_callback=lambda exc: self._failed(target, exc))
+        return True
+
+    def drain(self):
+        """Results finished since the last call."""
+        with self.lock:
+            done, self.done = self.done, []
+        return done
+
+    def join(self):
+        """Wait until every submitted target has finished."""
+        for _ in range(self.workers):
+            self.slots.acquire()
+        for _ in range(self.workers):
+            self.slots.release()
+        return self.drain()
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
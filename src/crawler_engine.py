@@ -4,10 +4,50 @@
 # Mission: Collect internal links, JS files, and API endpoints.
 # ============================================================
 
+import asyncio
 import concurrent.futures
-import requests
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+import time
+from collections import deque
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
+
+from core import http_transport
+from core.html_extract import extract_page
+
+# Budgets for the breadth-first crawler (per host)
+MAX_DEPTH = 3
+MAX_PAGES_PER_HOST = 150
+HOST_TIME_BUDGET = 120
+HOST_PARALLELISM = 4
+CRAWL_CONCURRENCY = 60
+
+
+def extract_links(html, base_url):
+    """Return (same-host links, script URLs) found in a page."""
+    found_links, found_scripts = set(), set()
+    page = extract_page(html)
+    base_host = urlparse(base_url).netloc
+
+    for href in page["links"]:
+        link = urljoin(base_url, href)
+        if urlparse(link).netloc == base_host:
+            found_links.add(link)
+
+    for src in page["scripts"]:
+        found_scripts.add(urljoin(base_url, src))
+
+    return found_links, found_scripts
+
+
+def normalize_url(url):
+    """Canonical form for the seen-set: lowercase host, no fragment/default port, sorted query."""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme == "http" and netloc.endswith(":80")) or (scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
 
 def crawl_single_target(target_data):
     """Crawls a live target and extracts URLs + scripts."""
@@ -18,17 +58,8 @@ def crawl_single_target(target_data):
     found_links, found_scripts = set(), set()
 
     try:
-        response = requests.get(url, timeout=8)
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        for a in soup.find_all("a", href=True):
-            link = urljoin(url, a["href"])
-            if urlparse(link).netloc == urlparse(url).netloc:
-                found_links.add(link)
-
-        for script in soup.find_all("script", src=True):
-            s_link = urljoin(url, script["src"])
-            found_scripts.add(s_link)
+        response = http_transport.get(url, timeout=8)
+        found_links, found_scripts = extract_links(response.text, url)
 
         print(f"[🕸️] Crawled {url} → {len(found_links)} links, {len(found_scripts)} scripts")
 
@@ -42,6 +73,136 @@ def crawl_single_target(target_data):
     }
 
 
+# ------------------------------------------------------------
+# Breadth-first async crawler
+# ------------------------------------------------------------
+async def _fetch_page(url, global_sem, deadline):
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return None
+    async with global_sem:
+        try:
+            return await asyncio.wait_for(http_transport.aget(url, timeout=8), remaining)
+        except Exception:
+            return None
+
+
+async def _crawl_host(target_data, out, global_sem, max_depth, max_pages, time_budget):
+    """BFS over one host under depth / page-count / time budgets."""
+    target = target_data["target"]
+    seed = normalize_url(target_data["live_url"])
+    deadline = time.monotonic() + time_budget
+
+    frontier = deque([(seed, 0)])
+    seen = {seed}
+    pages = 0
+
+    while frontier and pages < max_pages and time.monotonic() < deadline:
+        batch = []
+        while frontier and len(batch) < min(HOST_PARALLELISM, max_pages - pages):
+            batch.append(frontier.popleft())
+
+        responses = await asyncio.gather(
+            *(_fetch_page(url, global_sem, deadline) for url, _ in batch)
+        )
+
+        for (url, depth), r in zip(batch, responses):
+            if r is None:
+                continue
+            pages += 1
+            await out.put({"target": target, "type": "url", "url": url,
+                           "depth": depth, "status": r.status_code})
+
+            if "html" not in r.headers.get("Content-Type", ""):
+                continue
+            try:
+                links, scripts = extract_links(r.text, str(r.url))
+            except Exception:
+                continue
+
+            for s in scripts:
+                s = normalize_url(s)
+                if s not in seen:
+                    seen.add(s)
+                    await out.put({"target": target, "type": "script", "url": s, "depth": depth})
+
+            if depth >= max_depth:
+                continue
+            for link in links:
+                link = normalize_url(link)
+                if link not in seen and link.startswith(("http://", "https://")):
+                    seen.add(link)
+                    frontier.append((link, depth + 1))
+
+
+async def crawl_stream(probing_results, max_depth=MAX_DEPTH, max_pages=MAX_PAGES_PER_HOST,
+                       time_budget=HOST_TIME_BUDGET, concurrency=CRAWL_CONCURRENCY):
+    """
+    Crawl every live target concurrently and yield events as they are found:
+    {"target", "type": "url" | "script", "url", "depth", ["status"]}
+    """
+    out = asyncio.Queue(maxsize=1000)
+    global_sem = asyncio.Semaphore(concurrency)
+    live = [t for t in probing_results if t.get("status") == "alive" and t.get("live_url")]
+
+    async def run_host(t):
+        try:
+            await _crawl_host(t, out, global_sem, max_depth, max_pages, time_budget)
+        except Exception as e:
+            print(f"[⚠️] Crawl failed for {t.get('live_url')}: {e}")
+
+    async def run_all():
+        await asyncio.gather(*(run_host(t) for t in live))
+        await out.put(None)
+
+    runner = asyncio.create_task(run_all())
+    try:
+        while True:
+            event = await out.get()
+            if event is None:
+                break
+            yield event
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+
+async def _deep_crawl_batch(probing_results, on_url, **budgets):
+    results = {
+        t["target"]: {"target": t["target"], "urls": [], "scripts": []}
+        for t in probing_results
+    }
+    try:
+        async for event in crawl_stream(probing_results, **budgets):
+            key = "urls" if event["type"] == "url" else "scripts"
+            results[event["target"]][key].append(event["url"])
+            if on_url:
+                on_url(event)
+    finally:
+        await http_transport.aclose()
+    return list(results.values())
+
+
+def run_deep_crawl(probing_results, on_url=None, **budgets):
+    """
+    Multi-page BFS crawl of all live targets. `on_url(event)` fires for every
+    URL/script as soon as it is discovered, so vulnerability checks can start
+    before the crawl ends. Returns the same shape as run_crawling_batch.
+    """
+    print("[🌍] Starting breadth-first crawl...")
+    results = asyncio.run(_deep_crawl_batch(probing_results, on_url, **budgets))
+    for r in results:
+        if r["urls"] or r["scripts"]:
+            print(f"[🕸️] Crawled {r['target']} → {len(r['urls'])} pages, {len(r['scripts'])} scripts")
+    print(f"[✅] Crawling finished: {len(results)} domains processed.")
+    return results
+
+
+def crawl_host(target_data, **budgets):
+    """Blocking BFS crawl of one probed host → {"target", "urls", "scripts"}."""
+    return asyncio.run(_deep_crawl_batch([target_data], None, **budgets))[0]
+
+
 def run_crawling_batch(probing_results):
     """Runs crawling for all live domains."""
     print("[🌍] Starting web crawling phase...")
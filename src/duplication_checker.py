@@ -1,70 +1,176 @@
 import os
 import hashlib
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
 # ==============================================================
 #  DIGITAL SENTINEL MODULE — duplication_checker.py
 #  Purpose: Detect and handle duplicate scan results
 #  by hashing file contents and filtering identical findings
+#  Tiers: size → head/tail hash → full hash (only when needed),
+#  with a persistent (path, size, mtime) index so unchanged
+#  files are never re-read.
 # ==============================================================
 
 LOG_DIR = "data/logs"
 REPORT_DIR = "data/reports"
-HASH_INDEX_FILE = os.path.join(LOG_DIR, "hash_index.txt")
+HASH_INDEX_FILE = os.path.join(LOG_DIR, "hash_index.tsv")
+
+EDGE_BYTES = 64 * 1024          # head + tail sample for the partial hash
+READ_BLOCK = 1024 * 1024
+
+
+def _new_hasher():
+    """Fast non-cryptographic hash when xxhash is installed, blake2b otherwise."""
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def partial_hash(file_path, size):
+    """Hash of the first and last EDGE_BYTES (the whole file if it is small)."""
+    h = _new_hasher()
+    with open(file_path, "rb") as f:
+        if size <= 2 * EDGE_BYTES:
+            h.update(f.read())
+        else:
+            h.update(f.read(EDGE_BYTES))
+            f.seek(-EDGE_BYTES, os.SEEK_END)
+            h.update(f.read(EDGE_BYTES))
+    return h.hexdigest()
 
 
 def hash_file_content(file_path):
-    """Compute a SHA256 hash of a file content (safe read)."""
+    """Full-content hash, read in blocks (safe read)."""
     try:
+        h = _new_hasher()
         with open(file_path, "rb") as f:
-            content = f.read()
-            return hashlib.sha256(content).hexdigest()
+            for block in iter(lambda: f.read(READ_BLOCK), b""):
+                h.update(block)
+        return h.hexdigest()
     except Exception as e:
         print(f"[WARN] Cannot hash file {file_path}: {e}")
         return None
 
 
+# --------------------------------------------------------------
+#  Persistent index: path → (size, mtime_ns, partial, full)
+# --------------------------------------------------------------
+
+def load_index():
+    index = {}
+    if not os.path.exists(HASH_INDEX_FILE):
+        return index
+    try:
+        with open(HASH_INDEX_FILE, "r", encoding="utf-8") as idx:
+            for line in idx:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) != 5:
+                    continue
+                path, size, mtime, partial, full = parts
+                index[path] = {
+                    "size": int(size), "mtime": int(mtime),
+                    "partial": partial or None, "full": full or None,
+                }
+    except Exception as e:
+        print(f"[WARN] Could not read hash index: {e}")
+    return index
+
+
+def save_index(index):
+    os.makedirs(LOG_DIR, exist_ok=True)
+    tmp = HASH_INDEX_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as idx:
+        for path, e in index.items():
+            idx.write(f"{path}\t{e['size']}\t{e['mtime']}\t{e['partial'] or ''}\t{e['full'] or ''}\n")
+    os.replace(tmp, HASH_INDEX_FILE)
+
+
+def _ensure(index, paths, key, compute):
+    """Fill index[path][key] for paths missing it; returns True if anything was computed."""
+    missing = [p for p in paths if not index[p][key]]
+    if not missing:
+        return False
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for path, value in zip(missing, executor.map(compute, missing)):
+            index[path][key] = value
+    return True
+
+
+def _group(paths, key_fn):
+    groups = {}
+    for p in paths:
+        k = key_fn(p)
+        if k is not None:
+            groups.setdefault(k, []).append(p)
+    return [g for g in groups.values() if len(g) > 1]
+
+
 def check_duplicates():
     """Scan reports/logs for duplicates and remove redundant entries."""
     print("🔍 [INFO] Duplication Checker Running...")
 
-    all_files = []
+    old_index = load_index()
+    index = {}
+    dirty = False
+
+    # Tier 0: stat() only — reuse cached hashes when (size, mtime) are unchanged
     for base_dir in [LOG_DIR, REPORT_DIR]:
         if os.path.exists(base_dir):
             for root, _, files in os.walk(base_dir):
                 for name in files:
                     if name.endswith(".json") or name.endswith(".txt") or name.endswith(".log"):
-                        all_files.append(os.path.join(root, name))
+                        path = os.path.join(root, name)
+                        try:
+                            st = os.stat(path)
+                        except OSError:
+                            continue
+                        prev = old_index.get(path)
+                        if prev and prev["size"] == st.st_size and prev["mtime"] == st.st_mtime_ns:
+                            index[path] = prev
+                        else:
+                            index[path] = {"size": st.st_size, "mtime": st.st_mtime_ns,
+                                           "partial": None, "full": None}
+                            dirty = True
 
-    if not all_files:
+    if len(index) != len(old_index):
+        dirty = True
+
+    if not index:
         print("[WARN] No files found to check for duplicates.")
         return
 
-    print(f"[INFO] Found {len(all_files)} files to check for duplicates...")
+    print(f"[INFO] Found {len(index)} files to check for duplicates...")
+
+    def safe_partial(path):
+        try:
+            return partial_hash(path, index[path]["size"])
+        except Exception as e:
+            print(f"[WARN] Cannot hash file {path}: {e}")
+            return None
 
-    unique_hashes = {}
     duplicates = []
 
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        futures = {executor.submit(hash_file_content, f): f for f in all_files}
-        for future in as_completed(futures):
-            file_path = futures[future]
-            hash_value = future.result()
-            if not hash_value:
-                continue
-            if hash_value in unique_hashes:
-                duplicates.append(file_path)
+    # Tier 1: same size
+    for size_group in _group(index, lambda p: index[p]["size"]):
+        # Tier 2: same head/tail hash
+        dirty |= _ensure(index, size_group, "partial", safe_partial)
+        for partial_group in _group(size_group, lambda p: index[p]["partial"]):
+            # Tier 3: full hash (the partial already covers small files)
+            if index[partial_group[0]]["size"] <= 2 * EDGE_BYTES:
+                full_groups = [partial_group]
             else:
-                unique_hashes[hash_value] = file_path
+                dirty |= _ensure(index, partial_group, "full", hash_file_content)
+                full_groups = _group(partial_group, lambda p: index[p]["full"])
 
-    # Save index of unique hashes for later comparison
-    try:
-        os.makedirs(LOG_DIR, exist_ok=True)
-        with open(HASH_INDEX_FILE, "w") as idx:
-            for h, path in unique_hashes.items():
-                idx.write(f"{h} {path}\n")
-    except Exception as e:
-        print(f"[WARN] Could not write hash index: {e}")
+            for group in full_groups:
+                # keep the oldest copy, drop the rest
+                group.sort(key=lambda p: (index[p]["mtime"], p))
+                duplicates.extend(group[1:])
 
     if duplicates:
         print(f"[INFO] {len(duplicates)} duplicate files detected:")
@@ -72,9 +178,18 @@ def check_duplicates():
             print(f"   🗑️ {d}")
             try:
                 os.remove(d)
+                index.pop(d, None)
+                dirty = True
             except Exception as e:
                 print(f"[WARN] Could not remove {d}: {e}")
     else:
         print("[INFO] No duplicates found. ✅")
 
+    # Save index only when something changed
+    if dirty:
+        try:
+            save_index(index)
+        except Exception as e:
+            print(f"[WARN] Could not write hash index: {e}")
+
     print("✅ Duplication Checker finished.\n")
@@ -4,9 +4,10 @@
 import asyncio
 import socket
 import httpx
-from bs4 import BeautifulSoup
 import tldextract
 import os
+from core.port_scanner import PortScanner
+from core.html_extract import extract_title
 
 
 class ActiveIntelEngine:
@@ -16,17 +17,8 @@ class ActiveIntelEngine:
     async def fast_portscan(self, domain):
         """Perform asynchronous TCP port scan on common ports."""
         common_ports = [21, 22, 25, 53, 80, 110, 143, 443, 8080]
-        results = {}
-        for port in common_ports:
-            try:
-                conn = asyncio.open_connection(domain, port)
-                reader, writer = await asyncio.wait_for(conn, timeout=1.5)
-                results[port] = "open"
-                writer.close()
-                await writer.wait_closed()
-            except:
-                results[port] = "closed"
-        return results
+        scan = await PortScanner(timeout=1.5).scan_host(domain, common_ports)
+        return {p: "open" if scan["ports"].get(p) == "open" else "closed" for p in common_ports}
 
     async def grab_banner(self, domain, port):
         """Grab banner from open TCP port."""
@@ -46,9 +38,7 @@ class ActiveIntelEngine:
         try:
             url = f"http://{domain}"
             r = httpx.get(url, timeout=5)
-            soup = BeautifulSoup(r.text, "html.parser")
-            title = soup.title.string.strip() if soup.title else "No Title"
-            return title
+            return extract_title(r.text) or "No Title"
         except Exception as e:
             return f"HTTP fetch error: {e}"
 
@@ -1,10 +1,11 @@
 # src/engines/passive_intel_engine.py
 # Passive intelligence engine: performs WHOIS, DNS, and TLD extraction
 
-import requests
 import tldextract
 import os
 import socket
+from core.dns_resolver import resolve_host
+from core.intel_cache import cached_fetch
 
 
 class PassiveIntelEngine:
@@ -16,7 +17,7 @@ class PassiveIntelEngine:
         try:
             api = f"https://api.api-ninjas.com/v1/whois?domain={domain}"
             headers = {"X-Api-Key": os.getenv("API_NINJAS_KEY", "")}
-            r = requests.get(api, headers=headers, timeout=6)
+            r = cached_fetch("whois", domain, api, headers=headers, timeout=6)
             if r.status_code == 200:
                 data = r.json()
                 registrar = data.get("registrar", "Unknown")
@@ -30,7 +31,9 @@ class PassiveIntelEngine:
     def resolve_dns(self, domain):
         """Resolve A record of domain."""
         try:
-            ip = socket.gethostbyname(domain)
+            ip = resolve_host(domain)
+            if not ip:
+                raise socket.gaierror(f"no A/AAAA record for {domain}")
             return f"{domain} → {ip}"
         except Exception as e:
             return f"DNS resolution failed: {e}"
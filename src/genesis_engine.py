@@ -1,18 +1,12 @@
-import os, json, random
+import os, random
 from datetime import datetime
 
-MEMORY_FILE = "data/sentinel_memory.json"
-CHANGELOG = "data/genesis_changelog.json"
-SRC_PATH = "src/"
-
-def load_json(path, default=None):
-    try:
-        return json.load(open(path))
-    except Exception:
-        return default if default else {}
+from core.state_store import get_state_store
 
-def save_json(path, data):
-    json.dump(data, open(path, "w"), indent=2)
+MEMORY_FILE = "data/sentinel_memory.json"       # legacy, imported once
+CHANGELOG = "data/genesis_changelog.json"       # legacy, imported once
+CHANGELOG_STREAM = "genesis.changelog"
+SRC_PATH = "src/"
 
 def suggest_new_module():
     """AI generates name for next evolution module."""
@@ -47,16 +41,16 @@ def run():
     return filename
 
 def record_evolution(module):
-    changelog = load_json(CHANGELOG, {"history": []})
-    changelog["history"].append({
+    store = get_state_store()
+    store.migrate_once(CHANGELOG, lambda log: store.append_many(CHANGELOG_STREAM, log.get("history", [])))
+    store.append(CHANGELOG_STREAM, {
         "module": module,
         "timestamp": datetime.utcnow().isoformat()
     })
-    save_json(CHANGELOG, changelog)
 
 def run_genesis_cycle():
     """Genesis Engine — self-evolving intelligence."""
-    mem = load_json(MEMORY_FILE, {})
+    mem = get_state_store().load_namespace("sentinel_memory", MEMORY_FILE)
     if analyze_performance(mem):
         new_module = suggest_new_module()
         create_new_module(new_module)
@@ -3,32 +3,36 @@
 # Learns from every scan result to improve future bug discovery.
 # --------------------------------------------------------------
 
-import json
-import os
 from collections import defaultdict
 
-BRAIN_FILE = "data/brain.json"
+from core.state_store import get_state_store
 
+BRAIN_FILE = "data/brain.json"     # legacy, imported once into the state store
+BRAIN_TABLES = ("patterns", "company_heat", "url_signatures", "technology_hotspots")
+HISTORY_STREAM = "brain.history"
+HEAT_STREAM = "brain.heat"          # per-learn() heat deltas, followed by the scheduler
 
-def load_brain():
-    """Load previous learning data."""
-    if not os.path.exists(BRAIN_FILE):
-        return {
-            "patterns": {},
-            "company_heat": {},
-            "url_signatures": {},
-            "technology_hotspots": {},
-            "history": []
-        }
 
-    with open(BRAIN_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+def get_brain_store():
+    """State store with the legacy brain.json imported."""
+    store = get_state_store()
+    store.migrate_once(BRAIN_FILE, _import_legacy_brain)
+    return store
 
 
-def save_brain(brain):
-    """Save updated learning data."""
-    with open(BRAIN_FILE, "w", encoding="utf-8") as f:
-        json.dump(brain, f, indent=4)
+def _import_legacy_brain(brain):
+    store = get_state_store()
+    for table in BRAIN_TABLES:
+        store.incr_many(f"brain.{table}", brain.get(table, {}))
+    store.append_many(HISTORY_STREAM, brain.get("history", []))
+
+
+def load_brain(history_limit=100):
+    """Load learning data (only the most recent history entries)."""
+    store = get_brain_store()
+    brain = {table: store.counters(f"brain.{table}") for table in BRAIN_TABLES}
+    brain["history"] = store.tail(HISTORY_STREAM, history_limit)
+    return brain
 
 
 def learn(new_findings):
@@ -40,8 +44,11 @@ def learn(new_findings):
     - url
     - technology
     - category
+    Only the counters that change and the new history rows are written.
+    Returns the updated brain, as before (history = recent entries only).
     """
-    brain = load_brain()
+    deltas = defaultdict(lambda: defaultdict(int))
+    history = []
 
     for f in new_findings:
         target = f.get("target", "unknown")
@@ -51,58 +58,52 @@ def learn(new_findings):
         cat = f.get("category", "")
 
         # heat-level (ڕادەی گەرمبوون)
-        brain["company_heat"][target] = brain["company_heat"].get(target, 0) + (
+        deltas["company_heat"][target] += (
             5 if sev == "critical" else 3 if sev == "high" else 1
         )
 
         # URL signatures
         if url:
             sig = url.split("?")[0].replace("https://", "").replace("http://", "")
-            brain["url_signatures"][sig] = brain["url_signatures"].get(sig, 0) + 1
+            deltas["url_signatures"][sig] += 1
 
         # technology hotspots
         if tech:
-            brain["technology_hotspots"][tech] = brain["technology_hotspots"].get(tech, 0) + 1
+            deltas["technology_hotspots"][tech] += 1
 
         # learning patterns
         if cat:
-            brain["patterns"][cat] = brain["patterns"].get(cat, 0) + 1
+            deltas["patterns"][cat] += 1
 
         # register history
-        brain["history"].append({
+        history.append({
             "target": target,
             "severity": sev,
             "url": url,
             "category": cat
         })
 
-    save_brain(brain)
-    return brain
+    store = get_brain_store()
+    with store.transaction():
+        for table, values in deltas.items():
+            store.incr_many(f"brain.{table}", values)
+        store.append_many(HISTORY_STREAM, history)
+        if deltas["company_heat"]:
+            store.append(HEAT_STREAM, deltas["company_heat"])
+
+    return load_brain()
 
 
 def suggest_priority_targets(limit=10):
     """Return hottest companies sorted by severity history."""
-    brain = load_brain()
-    heat = brain.get("company_heat", {})
-
-    # sort by heat descending
-    sorted_targets = sorted(heat.items(), key=lambda x: x[1], reverse=True)
-    return [t[0] for t in sorted_targets[:limit]]
+    return [t for t, _ in get_brain_store().top("brain.company_heat", limit)]
 
 
 def suggest_hotspot_signatures(limit=10):
     """Return URLs that frequently appear in vulnerabilities."""
-    brain = load_brain()
-    sigs = brain.get("url_signatures", {})
-
-    sorted_sigs = sorted(sigs.items(), key=lambda x: x[1], reverse=True)
-    return [s[0] for s in sorted_sigs[:limit]]
+    return [s for s, _ in get_brain_store().top("brain.url_signatures", limit)]
 
 
 def suggest_hot_technologies(limit=10):
     """Return technologies that frequently have bugs."""
-    brain = load_brain()
-    techs = brain.get("technology_hotspots", {})
-
-    sorted_tech = sorted(techs.items(), key=lambda x: x[1], reverse=True)
-    return [t[0] for t in sorted_tech[:limit]]
+    return [t for t, _ in get_brain_store().top("brain.technology_hotspots", limit)]
@@ -13,11 +13,13 @@ import traceback
 from datetime import datetime
 
 # === Internal modules ===
-from enumeration_engine import run_enumeration_batch
-from probing_engine import run_probing_batch
-from crawler_engine import run_crawling_batch
-from vulnerability_scanner import run_vulnerability_scan_batch
-from ai_analyzer import run_ai_analysis_batch
+from enumeration_engine import run_enumeration, run_enumeration_batch
+from probing_engine import probe_hosts, run_probing_batch
+from crawler_engine import crawl_host, run_crawling_batch
+from vulnerability_scanner import scan_single_url, run_vulnerability_scan_batch
+from ai_analyzer import StreamingAnalysis, run_ai_analysis_batch
+from core.pipeline import Pipeline, Stage
+from core.deadline import get_run_deadline
 
 # 🧠 Discord reporting system
 try:
@@ -32,6 +34,11 @@ except ImportError:
 # ------------------------------------------------------------
 DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL")
 
+# Streaming mode: phases overlap, joined by bounded queues
+STREAMING = os.getenv("SENTINEL_STREAMING", "1") == "1"
+STAGE_WORKERS = {"enumerate": 4, "probe": 32, "crawl": 10, "scan": 20}
+DRAIN_RESERVE = float(os.getenv("SENTINEL_DRAIN_RESERVE", "120"))  # downstream time per admitted target
+
 if not DISCORD_WEBHOOK_URL:
     print("⚠️ Environment variable 'DISCORD_WEBHOOK_URL' not found!")
     print("💡 Please add it in GitHub repository secrets as: DISCORD_WEBHOOK_URL")
@@ -51,10 +58,82 @@ def load_targets(file_path="data/targets.txt"):
     return targets
 
 
+# ------------------------------------------------------------
+# Streaming phases
+# ------------------------------------------------------------
+def hosts_to_probe(target, subdomains):
+    """The target itself plus its subdomains (both modes probe the same set)."""
+    return list(dict.fromkeys([target] + list(subdomains)))
+
+
+def _enumerate_stage(target):
+    return hosts_to_probe(target, run_enumeration(target))
+
+
+def _probe_stage(host):
+    # fast path: TCP precheck on 443/80, then the open schemes race
+    results = probe_hosts([host])
+    data = results[0] if results else {"target": host, "status": "dead"}
+    status = "✅" if data["status"] == "alive" else "❌"
+    print(f"{status} {host}")
+    return [data] if data["status"] == "alive" else []
+
+
+def _crawl_stage(probe_result):
+    # multi-page BFS under the per-host depth / page / time budgets
+    return crawl_host(probe_result)["urls"]
+
+
+def _scan_stage(url):
+    return [scan_single_url(url)]
+
+
+def run_streaming_cycle(targets, deadline=None):
+    """
+    enumerate → probe → crawl → scan run as concurrent stages;
+    the first target's hosts are crawled while later targets are
+    still being enumerated. Under a run deadline, targets are only
+    admitted while their expected cost fits, and whatever is still
+    queued at the flush reserve is dropped so the report gets saved.
+    """
+    deadline = deadline or get_run_deadline()
+    analysis = StreamingAnalysis()
+    enumerate_stage = Stage("enumerate", _enumerate_stage, STAGE_WORKERS["enumerate"],
+                            maxsize=STAGE_WORKERS["enumerate"])  # admit targets as they are picked up
+    pipeline = Pipeline([
+        enumerate_stage,
+        Stage("probe", _probe_stage, STAGE_WORKERS["probe"]),
+        Stage("crawl", _crawl_stage, STAGE_WORKERS["crawl"]),
+        Stage("scan", _scan_stage, STAGE_WORKERS["scan"]),
+    ], sink=analysis.add)
+
+    def admitted():
+        for target in targets:
+            cost = enumerate_stage.avg_time() + DRAIN_RESERVE
+            if not deadline.can_admit(cost):
+                print(f"[⏳] {deadline.remaining():.0f}s left — not admitting {target} or later targets.")
+                return
+            yield target
+
+    timer = deadline.call_at_flush(pipeline.abort)
+    try:
+        stats = pipeline.run(admitted())
+    finally:
+        if timer:
+            timer.cancel()
+    print(f"[📈] Pipeline stats: {stats}")
+
+    report = analysis.report()
+    report["targets_admitted"] = stats["admitted"]
+    report["targets_total"] = len(targets)
+    report["partial"] = stats["admitted"] < len(targets) or stats["aborted"]
+    return report
+
+
 # ------------------------------------------------------------
 # Quantum main logic
 # ------------------------------------------------------------
-def main_cycle():
+def main_cycle(streaming=STREAMING):
     print("\n🚀 [QUANTUM] Launching Main Quantum Controller v11.4")
     print("===================================================")
 
@@ -66,20 +145,25 @@ def main_cycle():
         targets = load_targets()
         print(f"[🎯] Loaded {len(targets)} targets for scanning.")
 
-        # === Phase 2: Enumeration ===
-        enumeration_results = run_enumeration_batch(targets)
+        if streaming:
+            # === Phases 2-6: streamed through bounded queues ===
+            final_report = run_streaming_cycle(targets)
+        else:
+            # === Phase 2: Enumeration ===
+            enumeration_results = run_enumeration_batch(targets)
 
-        # === Phase 3: Probing ===
-        probing_results = run_probing_batch(enumeration_results)
+            # === Phase 3: Probing ===
+            hosts = [h for t, subs in enumeration_results.items() for h in hosts_to_probe(t, subs)]
+            probing_results = run_probing_batch(hosts)
 
-        # === Phase 4: Crawling ===
-        crawling_results = run_crawling_batch(probing_results)
+            # === Phase 4: Crawling ===
+            crawling_results = run_crawling_batch(probing_results)
 
-        # === Phase 5: Vulnerability scanning ===
-        vuln_results = run_vulnerability_scan_batch(crawling_results)
+            # === Phase 5: Vulnerability scanning ===
+            vuln_results = run_vulnerability_scan_batch(crawling_results)
 
-        # === Phase 6: AI-based analysis ===
-        final_report = run_ai_analysis_batch(vuln_results)
+            # === Phase 6: AI-based analysis ===
+            final_report = run_ai_analysis_batch(vuln_results)
 
         # === Phase 7: Save report locally ===
         os.makedirs("data/results/final_reports", exist_ok=True)
@@ -1,24 +1,18 @@
-import subprocess
+from core.dns_resolver import filter_resolvable
+from probing_engine import probe_hosts, HTTPS_ONLY
+
+MOBILE_PREFIXES = ["api", "mobile", "m", "app", "client", "gateway"]
 
-def mobile_api_recon(domain):
 
-    patterns = [
-        f"https://api.{domain}",
-        f"https://mobile.{domain}",
-        f"https://m.{domain}",
-        f"https://app.{domain}",
-        f"https://client.{domain}",
-        f"https://gateway.{domain}"
-    ]
+def mobile_api_recon(domain):
 
-    alive = []
+    candidates = [f"{prefix}.{domain}" for prefix in MOBILE_PREFIXES]
 
-    for url in patterns:
-        try:
-            out = subprocess.getoutput(f"httpx -silent -status-code -title -url {url}")
-            if url in out:
-                alive.append(url)
-        except:
-            pass
+    # prune NXDOMAIN names in one bulk DNS step, then probe the rest in one pass
+    try:
+        resolvable = filter_resolvable(candidates)
+        probes = probe_hosts(resolvable, precheck=HTTPS_ONLY)
+    except Exception:
+        return []
 
-    return alive
+    return [p["live_url"] for p in probes if p["status"] == "alive"]
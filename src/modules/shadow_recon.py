@@ -1,4 +1,5 @@
-import subprocess
+from core.dns_resolver import filter_resolvable
+from probing_engine import probe_hosts, HTTPS_ONLY
 
 COMMON_SHADOW = [
     "admin", "dashboard", "internal", "portal",
@@ -6,16 +7,15 @@ COMMON_SHADOW = [
     "login", "auth", "api", "backend",
 ]
 
+
 def shadow_recon(domain):
-    results = []
+    candidates = [f"{prefix}.{domain}" for prefix in COMMON_SHADOW]
 
-    for prefix in COMMON_SHADOW:
-        sub = f"{prefix}.{domain}"
-        try:
-            out = subprocess.getoutput(f"httpx -silent -timeout 4 -no-color -title -status-code -url https://{sub}")
-            if sub in out:
-                results.append(sub)
-        except:
-            pass
+    # prune NXDOMAIN names in one bulk DNS step, then probe the rest in one pass
+    try:
+        resolvable = filter_resolvable(candidates)
+        probes = probe_hosts(resolvable, precheck=HTTPS_ONLY)
+    except Exception:
+        return []
 
-    return results
+    return [p["target"] for p in probes if p["status"] == "alive"]
@@ -1,4 +1,5 @@
-import subprocess
+import asyncio
+import signal
 import json
 import os
 
@@ -12,51 +13,127 @@ TOOLS = [
     "findomain"
 ]
 
-def run_tool(tool, domain):
+TOOL_TIMEOUT = 900  # seconds per tool before it gets killed
+
+
+def build_command(tool, domain):
+    if tool == "subfinder":
+        return ["subfinder", "-d", domain, "-silent"]
+    if tool == "assetfinder":
+        return ["assetfinder", domain]
+    if tool == "amass":
+        return ["amass", "enum", "-d", domain, "-passive"]
+    if tool == "findomain":
+        return ["findomain", "-t", domain, "-q"]
+    return None
+
+
+def normalize_subdomain(line, domain):
+    """Lowercase, strip wildcards/trailing dots, keep only names under `domain`."""
+    name = line.strip().lower().rstrip(".")
+    if name.startswith("*."):
+        name = name[2:]
+    if name == domain or name.endswith("." + domain):
+        return name
+    return None
+
+
+# ---------------------------------------------------
+# Concurrent streaming runner
+# ---------------------------------------------------
+
+def kill_process_group(proc):
+    """Kill a tool and every child it spawned (tools run in their own session)."""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def _stream_tool(tool, domain, queue, timeout):
+    """Run one tool and push every normalised line into `queue`."""
+    cmd = build_command(tool, domain)
+    proc = None
     try:
+        if not cmd:
+            return
         print(f"🔎 Running {tool} on {domain} ...")
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=True,
+        )
 
-        if tool == "subfinder":
-            cmd = ["subfinder", "-d", domain, "-silent"]
-        elif tool == "assetfinder":
-            cmd = ["assetfinder", domain]
-        elif tool == "amass":
-            cmd = ["amass", "enum", "-d", domain, "-passive"]
-        elif tool == "findomain":
-            cmd = ["findomain", "-t", domain, "-q"]
-        else:
-            return []
-
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"⚠️ Error running {tool}: {result.stderr}")
-            return []
-
-        output = result.stdout.splitlines()
-        return output
+        async def pump():
+            async for raw in proc.stdout:
+                name = normalize_subdomain(raw.decode(errors="ignore"), domain)
+                if name:
+                    await queue.put(name)
 
+        await asyncio.wait_for(pump(), timeout=timeout)
+        await proc.wait()
+
+    except asyncio.TimeoutError:
+        print(f"⏱️ {tool} exceeded {timeout}s on {domain} — killed")
+    except FileNotFoundError:
+        print(f"⚠️ {tool} is not installed, skipping")
     except Exception as e:
         print(f"❌ Exception in {tool}: {e}")
-        return []
+    finally:
+        if proc and proc.returncode is None:
+            kill_process_group(proc)
+            await proc.wait()
+        await queue.put(None)
 
 
-def run_expander(domain):
-    print(f"🚀 Expanding subdomains for: {domain}")
-    
-    all_subdomains = []
+async def stream_subdomains(domain, tools=TOOLS, timeout=TOOL_TIMEOUT):
+    """
+    Launch every tool at once and yield each new unique subdomain
+    as soon as any tool prints it.
+    """
+    queue = asyncio.Queue()
+    seen = set()
+    tasks = [asyncio.create_task(_stream_tool(t, domain, queue, timeout)) for t in tools]
+    remaining = len(tasks)
 
-    for tool in TOOLS:
-        found = run_tool(tool, domain)
-        all_subdomains.extend(found)
+    try:
+        while remaining:
+            name = await queue.get()
+            if name is None:
+                remaining -= 1
+                continue
+            if name not in seen:
+                seen.add(name)
+                yield name
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
-    # remove duplicates
-    all_subdomains = list(set(all_subdomains))
 
-    # save result
+async def _expand(domain, on_subdomain, timeout):
+    found = []
     outfile = os.path.join(OUTPUT_DIR, f"{domain}.txt")
+
     with open(outfile, "w") as f:
-        for sub in all_subdomains:
+        async for sub in stream_subdomains(domain, timeout=timeout):
+            found.append(sub)
             f.write(sub + "\n")
+            f.flush()
+            if on_subdomain:
+                on_subdomain(sub)
+
+    return found
+
+
+def run_expander(domain, on_subdomain=None, timeout=TOOL_TIMEOUT):
+    """
+    Expand subdomains with all tools concurrently.
+    `on_subdomain(name)` is called for every new name as it appears,
+    so downstream stages can start before the slowest tool finishes.
+    """
+    print(f"🚀 Expanding subdomains for: {domain}")
+
+    all_subdomains = asyncio.run(_expand(domain, on_subdomain, timeout))
 
     print(f"✅ Expansion done → {len(all_subdomains)} subdomains found")
     return all_subdomains
@@ -1,9 +1,10 @@
 import json
 import random
 import string
-import requests
 from datetime import datetime
 
+from core import http_transport
+
 # --------------------------------------------
 #  Auto PoC Generator — Digital Sentinel v7.0
 # --------------------------------------------
@@ -52,7 +53,7 @@ def validate_poc(poc):
     Actually send the PoC request to confirm if the issue is real.
     """
     try:
-        response = requests.get(
+        response = http_transport.get(
             poc["url"],
             headers={"User-Agent": "DigitalSentinel-AutoPoC"},
             timeout=6
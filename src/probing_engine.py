@@ -4,10 +4,20 @@
 # Mission: Validate live domains, collect headers and responses
 # ============================================================
 
+import asyncio
 import concurrent.futures
-import requests
 import time
 
+from core import http_transport
+from core.port_scanner import PortScanner
+
+PRECHECK_PORTS = {443: "https://", 80: "http://"}
+HTTPS_ONLY = {443: "https://"}     # precheck for hosts only worth probing over TLS
+PRECHECK_TIMEOUT = 1.5
+PROBE_TIMEOUT = 5
+FAST_CONCURRENCY = 200
+
+
 def probe_single_target(target):
     """Probes a single target via HTTP(S) and returns status info."""
     protocols = ["https://", "http://"]
@@ -23,7 +33,7 @@ def probe_single_target(target):
         url = f"{proto}{target}"
         try:
             start = time.time()
-            response = requests.get(url, timeout=5)
+            response = http_transport.get(url, timeout=5)
             elapsed = round(time.time() - start, 2)
 
             result.update({
@@ -38,23 +48,118 @@ def probe_single_target(target):
     return result
 
 
-def run_probing_batch(targets):
+# ------------------------------------------------------------
+# Fast mode: TCP pre-check, then race both schemes
+# ------------------------------------------------------------
+async def _fetch_scheme(proto, target, accept):
+    url = f"{proto}{target}"
+    start = time.time()
+    response = await http_transport.aget(url, timeout=PROBE_TIMEOUT)
+    if accept and not accept(response):
+        raise ValueError(f"rejected response {response.status_code} from {url}")
+    return url, response, round(time.time() - start, 2)
+
+
+async def race_schemes(target, protocols=("https://", "http://"), accept=None):
+    """
+    Fetch every scheme concurrently and keep the first good answer.
+    Returns (url, response, elapsed) or None.
+    """
+    tasks = [asyncio.create_task(_fetch_scheme(p, target, accept)) for p in protocols]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            try:
+                return await fut
+            except Exception:
+                continue
+        return None
+    finally:
+        for t in tasks:
+            t.cancel()
+
+
+async def probe_single_target_fast(target, scanner=None, accept=None, precheck=PRECHECK_PORTS):
+    """TCP connect check on 443/80 first; only open ports get an HTTP probe."""
+    scanner = scanner or PortScanner(timeout=PRECHECK_TIMEOUT)
+    result = {
+        "target": target,
+        "status": "dead",
+        "live_url": None,
+        "response_time": None,
+        "code": None,
+        "server": None,
+        "tcp_rtt": None,
+    }
+
+    scan = await scanner.scan_host(target, list(precheck))
+    if not scan["open_ports"]:
+        return result
+
+    result["tcp_rtt"] = min(scan["rtt"].values())
+    protocols = [precheck[p] for p in precheck if p in scan["open_ports"]]
+
+    hit = await race_schemes(target, protocols, accept)
+    if hit:
+        url, response, elapsed = hit
+        result.update({
+            "status": "alive",
+            "live_url": url,
+            "code": response.status_code,
+            "server": response.headers.get("Server", "unknown"),
+            "response_time": elapsed
+        })
+    return result
+
+
+async def _run_fast_batch(targets, accept=None, precheck=PRECHECK_PORTS):
+    scanner = PortScanner(timeout=PRECHECK_TIMEOUT)
+    sem = asyncio.Semaphore(FAST_CONCURRENCY)
+
+    async def bounded(t):
+        async with sem:
+            try:
+                return await probe_single_target_fast(t, scanner, accept, precheck)
+            except Exception as e:
+                print(f"[⚠️] Probing error for {t}: {e}")
+                return None
+
+    try:
+        return [r for r in await asyncio.gather(*(bounded(t) for t in targets)) if r]
+    finally:
+        await http_transport.aclose()
+
+
+def probe_hosts(targets, accept=None, precheck=PRECHECK_PORTS):
+    """
+    Blocking fast-mode probe of many hosts (no logging).
+    `precheck` maps the ports to TCP-check onto the scheme each one serves.
+    """
+    return asyncio.run(_run_fast_batch(list(targets), accept, precheck))
+
+
+def run_probing_batch(targets, fast=True):
     """Runs concurrent HTTP probing across all targets."""
     print(f"[🌐] Starting HTTP probing for {len(targets)} targets...")
     results = []
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=15) as executor:
-        future_to_target = {executor.submit(probe_single_target, t): t for t in targets}
+    if fast:
+        results = probe_hosts(targets)
+        for data in results:
+            status = "✅" if data["status"] == "alive" else "❌"
+            print(f"{status} {data['target']}")
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=15) as executor:
+            future_to_target = {executor.submit(probe_single_target, t): t for t in targets}
 
-        for future in concurrent.futures.as_completed(future_to_target):
-            target = future_to_target[future]
-            try:
-                data = future.result()
-                results.append(data)
-                status = "✅" if data["status"] == "alive" else "❌"
-                print(f"{status} {target}")
-            except Exception as e:
-                print(f"[⚠️] Probing error for {target}: {e}")
+            for future in concurrent.futures.as_completed(future_to_target):
+                target = future_to_target[future]
+                try:
+                    data = future.result()
+                    results.append(data)
+                    status = "✅" if data["status"] == "alive" else "❌"
+                    print(f"{status} {target}")
+                except Exception as e:
+                    print(f"[⚠️] Probing error for {target}: {e}")
 
     print(f"[🔎] Probing completed. {len([r for r in results if r['status']=='alive'])} live targets found.")
     return results
@@ -3,36 +3,116 @@
 # =====================================================
 # Purpose: Self-learning intelligence layer that monitors
 # patterns, detects anomalies, and auto-optimizes scanning logic.
+# Recent observations live in a fixed-size ring buffer, so every
+# check costs the same however long the engine has been running.
 # =====================================================
 
 import os
-import json
+import atexit
 import numpy as np
 from datetime import datetime
-from collections import Counter
+
+from core.state_store import get_state_store
 
 AWARENESS_LOG = "data/logs/quantum_awareness.log"
 os.makedirs(os.path.dirname(AWARENESS_LOG), exist_ok=True)
 
+WINDOW = 512                 # ring buffer size (recent observations)
+MIN_OBSERVATIONS = 10        # no verdicts before the window has this many
+Z_THRESHOLD = 3.0            # |z| above this on any feature → anomaly
+PERSIST_BATCH = 50           # findings buffered before one store write
+
+SEVERITY_SCORE = {"CRITICAL": 4, "HIGH": 3, "MEDIUM": 2, "LOW": 1, "INFO": 0}
+FEATURES = ("severity", "response_size", "latency")
+
 
 class QuantumAwarenessEngine:
     def __init__(self):
-        self.memory_file = "data/ai_memory.json"
-        self.load_memory()
+        self.memory_file = "data/ai_memory.json"   # legacy, imported once
+        self.store = get_state_store()
+        self.store.migrate_once(self.memory_file, self._import_legacy)
+
+        # ring buffer: one row per observation, NaN = feature unknown
+        self.window = np.full((WINDOW, len(FEATURES)), np.nan)
+        self.head = 0
+        self.filled = 0
+        self.last_z = None
+        # running per-feature n / sum / sum of squares over the window
+        self.n = np.zeros(len(FEATURES))
+        self.sum = np.zeros(len(FEATURES))
+        self.sumsq = np.zeros(len(FEATURES))
+
+        # running totals for the whole lifetime (not just the window)
+        self.severity_counts = {
+            k: int(v) for k, v in self.store.counters("awareness.severity").items()
+        }
+        self.pending_patterns = []
+        self.pending_anomalies = []
+
+        for pattern in self.store.tail("awareness.patterns", WINDOW):
+            self._push(pattern)
+        atexit.register(self.flush)
+
+    # -------------------------------------------------
+    # Legacy memory import
+    # -------------------------------------------------
+    def _import_legacy(self, memory):
+        patterns = memory.get("patterns", [])
+        self.store.append_many("awareness.patterns", patterns)
+        self.store.append_many("awareness.feedback", memory.get("feedback", []))
+        self.store.append_many("awareness.anomalies", memory.get("anomalies", []))
+        severities = {}
+        for p in patterns:
+            sev = str(p.get("severity"))
+            severities[sev] = severities.get(sev, 0) + 1
+        self.store.incr_many("awareness.severity", severities)
 
     # -------------------------------------------------
-    # Load / save memory
+    # Ring buffer
     # -------------------------------------------------
-    def load_memory(self):
-        if os.path.exists(self.memory_file):
-            with open(self.memory_file, "r", encoding="utf-8") as f:
-                self.memory = json.load(f)
-        else:
-            self.memory = {"patterns": [], "feedback": [], "anomalies": []}
+    @staticmethod
+    def _features(pattern):
+        def num(v):
+            try:
+                return float(v)
+            except (TypeError, ValueError):
+                return np.nan
+        sev = SEVERITY_SCORE.get(str(pattern.get("severity")).upper(), np.nan)
+        return np.array([sev, num(pattern.get("response_size")), num(pattern.get("latency"))])
 
-    def save_memory(self):
-        with open(self.memory_file, "w", encoding="utf-8") as f:
-            json.dump(self.memory, f, indent=2)
+    def _accumulate(self, row, sign):
+        known = ~np.isnan(row)
+        vals = np.where(known, row, 0.0)
+        self.n += sign * known
+        self.sum += sign * vals
+        self.sumsq += sign * vals * vals
+
+    def _push(self, pattern):
+        row = self._features(pattern)
+        if self.filled == WINDOW:
+            self._accumulate(self.window[self.head], -1)   # evict the oldest
+        self.window[self.head] = row
+        self._accumulate(row, +1)
+        self.head = (self.head + 1) % WINDOW
+        self.filled = min(self.filled + 1, WINDOW)
+
+        if self.head == 0:
+            # once per lap: recompute exactly so float error cannot build up
+            known = ~np.isnan(self.window)
+            vals = np.where(known, self.window, 0.0)
+            self.n = known.sum(axis=0).astype(float)
+            self.sum = vals.sum(axis=0)
+            self.sumsq = (vals * vals).sum(axis=0)
+
+    def zscores(self, values):
+        """Vectorised z-scores of `values` (n x features) against the current window."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.sum / self.n
+            std = np.sqrt(np.maximum(self.sumsq / self.n - mean * mean, 0.0))
+            std[std <= 1e-9 * np.abs(mean)] = 0.0   # constant feature, rounding noise only
+            z = (np.atleast_2d(values) - mean) / std
+        z[~np.isfinite(z)] = 0.0   # unknown feature or zero variance → no signal
+        return z
 
     # -------------------------------------------------
     # Register finding pattern
@@ -42,34 +122,63 @@ class QuantumAwarenessEngine:
             "severity": finding.get("severity"),
             "cvss": finding.get("cvss"),
             "domain": finding.get("domain"),
+            "response_size": finding.get("response_size",
+                                         len(finding["response"]) if finding.get("response") else None),
+            "latency": finding.get("latency", finding.get("response_time")),
             "time": datetime.utcnow().isoformat()
         }
-        self.memory["patterns"].append(pattern)
-        self.save_memory()
+
+        # score against the window *before* this observation joins it
+        self.last_z = None
+        if self.filled >= MIN_OBSERVATIONS:
+            self.last_z = (pattern, self.zscores(self._features(pattern))[0])
+        self._push(pattern)
+
+        sev = str(pattern["severity"])
+        self.severity_counts[sev] = self.severity_counts.get(sev, 0) + 1
+        self.pending_patterns.append(pattern)
+        if len(self.pending_patterns) >= PERSIST_BATCH:
+            self.flush()
 
     # -------------------------------------------------
     # Detect anomaly or rare event
     # -------------------------------------------------
     def detect_anomalies(self):
-        if len(self.memory["patterns"]) < 10:
+        """Checks the latest finding's rolling z-scores (constant cost)."""
+        if self.last_z is None:
             return None
 
-        severities = [p["severity"] for p in self.memory["patterns"]]
-        counts = Counter(severities)
-        most_common = counts.most_common(1)[0][0]
+        pattern, z = self.last_z
+        self.last_z = None
+        outliers = [f"{name} z={z[i]:+.1f}" for i, name in enumerate(FEATURES)
+                    if abs(z[i]) > Z_THRESHOLD]
 
-        recent = self.memory["patterns"][-5:]
-        recent_sev = [r["severity"] for r in recent]
-        anomaly = any(s != most_common for s in recent_sev)
-
-        if anomaly:
-            msg = f"Anomaly detected: unusual severity pattern {recent_sev}"
+        if outliers:
+            msg = (f"Anomaly detected: {pattern.get('domain')} "
+                   f"[{pattern.get('severity')}] {', '.join(outliers)}")
             self.log(msg)
-            self.memory["anomalies"].append(msg)
-            self.save_memory()
+            self.pending_anomalies.append(msg)
             return msg
         return None
 
+    # -------------------------------------------------
+    # Batched persistence
+    # -------------------------------------------------
+    def flush(self):
+        """Write buffered patterns, severity counts and anomalies in one transaction."""
+        if not self.pending_patterns and not self.pending_anomalies:
+            return
+        deltas = {}
+        for p in self.pending_patterns:
+            sev = str(p["severity"])
+            deltas[sev] = deltas.get(sev, 0) + 1
+        with self.store.transaction():
+            self.store.append_many("awareness.patterns", self.pending_patterns)
+            self.store.incr_many("awareness.severity", deltas)
+            self.store.append_many("awareness.anomalies", self.pending_anomalies)
+        self.pending_patterns = []
+        self.pending_anomalies = []
+
     # -------------------------------------------------
     # Adaptive scan tuning
     # -------------------------------------------------
@@ -77,8 +186,8 @@ class QuantumAwarenessEngine:
         """
         Adjusts scan parallelism and depth based on previous success ratios.
         """
-        total = len(self.memory["patterns"])
-        critical = len([p for p in self.memory["patterns"] if p["severity"] == "CRITICAL"])
+        total = sum(self.severity_counts.values())
+        critical = self.severity_counts.get("CRITICAL", 0)
         ratio = critical / total if total else 0
 
         tuned_config = base_config.copy()
@@ -2,8 +2,10 @@ import json
 import random
 from datetime import datetime
 
+from core.state_store import get_state_store
+
 THREAT_FEED = "data/sentinel_threat_feed.json"
-MEMORY_FILE = "data/sentinel_memory.json"
+MEMORY_FILE = "data/sentinel_memory.json"   # legacy, imported once
 
 def load_json(path):
     try:
@@ -46,7 +48,7 @@ def generate_reasoning_summary(correlations):
 def run_quantum_reasoning():
     """Main reasoning engine entrypoint."""
     feed = load_json(THREAT_FEED)
-    mem = load_json(MEMORY_FILE)
+    mem = get_state_store().load_namespace("sentinel_memory", MEMORY_FILE)
     last_targets = mem.get("last_targets", [])
     cor = correlate_threats(feed, last_targets)
     result = generate_reasoning_summary(cor)
@@ -1,12 +1,17 @@
 import subprocess
 
+from core.intel_cache import cached_fetch
+
+CRTSH_TIMEOUT = 120   # crt.sh routinely takes 30s+ on large domains
+
 def passive_recon(domain):
 
     results = {}
 
     # 1) crt.sh subdomain enumeration
     try:
-        crt = subprocess.getoutput(f'curl -s "https://crt.sh/?q=%25.{domain}&output=json"')
+        crt = cached_fetch("crtsh", domain, f"https://crt.sh/?q=%25.{domain}&output=json",
+                           timeout=CRTSH_TIMEOUT).text
         results["crt"] = crt
     except:
         results["crt"] = "error"
@@ -1,11 +1,13 @@
 import os
 import json
 import time
-import socket
 import requests
 import subprocess
 import concurrent.futures
 from datetime import datetime
+from core import port_scanner
+from core.intel_cache import cached_fetch
+from probing_engine import probe_hosts
 
 DISCORD_WEBHOOK = os.getenv("DISCORD_WEBHOOK")
 
@@ -52,13 +54,14 @@ def find_subdomains(domain):
 
     # Passive APIs (can expand later)
     sources = [
-        f"https://crt.sh/?q=%25.{domain}&output=json",
-        f"https://dns.bufferover.run/dns?q=. {domain}",
+        ("crtsh", f"https://crt.sh/?q=%25.{domain}&output=json"),
+        ("bufferover", f"https://dns.bufferover.run/dns?q=. {domain}"),
     ]
 
-    for src in sources:
+    for source, src in sources:
         try:
-            resp = requests.get(src, timeout=HTTP_TIMEOUT, headers={"User-Agent": "EternalHunter/1.0"})
+            resp = cached_fetch(source, domain, src, timeout=HTTP_TIMEOUT,
+                                headers={"User-Agent": "EternalHunter/1.0"})
             if resp.status_code == 200 and "json" in resp.headers.get("Content-Type", ""):
                 data = resp.json()
                 for item in data:
@@ -77,34 +80,26 @@ def find_subdomains(domain):
 # ============================================
 # 🌐 HTTP PROBE
 # ============================================
+def _accept_live(resp):
+    return resp.status_code < 500
+
+
+def _as_live_host(probe):
+    return {"url": probe["live_url"], "status": probe["code"], "server": probe["server"]}
+
+
 def probe_http(url):
     """Check if a subdomain is live via HTTP(S)."""
-    schemes = ["https://", "http://"]
-    for scheme in schemes:
-        try:
-            resp = requests.get(scheme + url, timeout=HTTP_TIMEOUT)
-            if resp.status_code < 500:
-                return {"url": scheme + url, "status": resp.status_code, "server": resp.headers.get("Server", "unknown")}
-        except Exception:
-            pass
+    for probe in probe_hosts([url], accept=_accept_live):
+        if probe["status"] == "alive":
+            return _as_live_host(probe)
     return None
 
 # ============================================
 # 🔓 PORT SCANNING
 # ============================================
 def scan_ports(target):
-    open_ports = []
-    for port in PORT_SCAN_LIMIT:
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex((target, port))
-            if result == 0:
-                open_ports.append(port)
-            sock.close()
-        except Exception:
-            pass
-    return open_ports
+    return port_scanner.scan_ports(target, PORT_SCAN_LIMIT, timeout=1)["open_ports"]
 
 # ============================================
 # ⚡ PARALLEL EXECUTION ENGINE
@@ -113,14 +108,11 @@ def recon_target(domain):
     log(f"Starting recon for {domain}")
     try:
         subdomains = find_subdomains(domain)
-        live_hosts = []
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            futures = {executor.submit(probe_http, sub): sub for sub in subdomains}
-            for future in concurrent.futures.as_completed(futures):
-                result = future.result()
-                if result:
-                    live_hosts.append(result)
+        live_hosts = [
+            _as_live_host(p)
+            for p in probe_hosts(subdomains, accept=_accept_live)
+            if p["status"] == "alive"
+        ]
 
         open_ports = scan_ports(domain)
 
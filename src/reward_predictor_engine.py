@@ -7,6 +7,8 @@
 import hashlib
 import random
 
+from core.dedupe_store import get_dedupe_store
+
 
 class RewardPredictor:
 
@@ -21,12 +23,6 @@ class RewardPredictor:
         "info":     (0, 0)
     }
 
-    # =====================================================================
-    # Fake database to detect duplicates
-    # (Your system can connect to real API later)
-    # =====================================================================
-    DUPLICATE_MEMORY = set()
-
     # =====================================================================
     # Build unique hash for each vulnerability
     # =====================================================================
@@ -83,11 +79,8 @@ class RewardPredictor:
         # ---------------------------------------------------------------
         # Detect duplicates (has someone reported EXACT same bug?)
         # ---------------------------------------------------------------
-        if fingerprint in self.DUPLICATE_MEMORY:
-            duplicate = True
-        else:
-            duplicate = False
-            self.DUPLICATE_MEMORY.add(fingerprint)
+        # (persistent store shared by all worker processes)
+        duplicate = not get_dedupe_store().add(fingerprint, scope="reward")
 
         # ---------------------------------------------------------------
         # Predict Reward
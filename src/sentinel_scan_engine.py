@@ -2,9 +2,15 @@
 # Digital Sentinel v11.3 - Autonomous Scan Engine
 # =====================================================
 import subprocess
+import asyncio
+import json
 import os
 from datetime import datetime
 
+from modules.subdomain_expander_v2 import kill_process_group
+
+PIPELINE_TIMEOUT = 3600   # seconds for the whole streaming pipeline before it is killed
+
 class SentinelScanEngine:
     def __init__(self, target, output_dir="data/reports"):
         self.target = target.strip()
@@ -53,10 +59,155 @@ class SentinelScanEngine:
         cmd = f"nuclei -l {self.output_dir}/live_hosts.txt -t cves/ -o {self.output_dir}/vulns_{timestamp}.txt"
         return self._run_tool(cmd, f"nuclei_{timestamp}.log")
 
+    # ----------------------------
+    # Streaming Pipeline
+    # subfinder → httpx → nuclei (+ katana), all stages overlapping
+    # ----------------------------
+    async def _spawn(self, *cmd, stdin=False):
+        """Start a tool in its own session; None if it is not installed."""
+        try:
+            return await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE if stdin else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        except FileNotFoundError:
+            print(f"⚠️ {cmd[0]} is not installed, skipping")
+            return None
+
+    async def _feed(self, proc, line):
+        """Write one line to a downstream tool; ignore tools that already exited."""
+        if proc is None or proc.stdin.is_closing():
+            return
+        try:
+            proc.stdin.write((line + "\n").encode())
+            await proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    async def _close_stdin(self, proc):
+        if proc is None or proc.stdin.is_closing():
+            return
+        try:
+            proc.stdin.close()
+            await proc.stdin.wait_closed()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    async def _stream_pipeline(self, on_finding=None, timeout=PIPELINE_TIMEOUT):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+        paths = {
+            "subdomains": os.path.join(self.output_dir, "subdomains.txt"),
+            "live_hosts": os.path.join(self.output_dir, "live_hosts.txt"),
+            "vulns": os.path.join(self.output_dir, f"vulns_{timestamp}.jsonl"),
+        }
+        counts = {"subdomains": 0, "live_hosts": 0, "findings": 0}
+        procs = []
+
+        async def spawn(*cmd, stdin=False):
+            proc = await self._spawn(*cmd, stdin=stdin)
+            if proc is not None:
+                procs.append(proc)
+            return proc
+
+        async def subdomains_to_httpx():
+            with open(paths["subdomains"], "w") as out:
+                if subfinder is not None:
+                    async for raw in subfinder.stdout:
+                        sub = raw.decode(errors="ignore").strip()
+                        if not sub:
+                            continue
+                        out.write(sub + "\n")
+                        counts["subdomains"] += 1
+                        await self._feed(httpx, sub)
+            await self._close_stdin(httpx)
+
+        async def live_to_nuclei():
+            with open(paths["live_hosts"], "w") as out:
+                if httpx is not None:
+                    async for raw in httpx.stdout:
+                        host = raw.decode(errors="ignore").strip()
+                        if not host:
+                            continue
+                        out.write(host + "\n")
+                        out.flush()
+                        counts["live_hosts"] += 1
+                        await self._feed(nuclei, host)
+                        await self._feed(katana, host)
+            await self._close_stdin(nuclei)
+            await self._close_stdin(katana)
+
+        async def collect_findings():
+            with open(paths["vulns"], "w") as out:
+                if nuclei is None:
+                    return
+                async for raw in nuclei.stdout:
+                    try:
+                        finding = json.loads(raw)
+                    except ValueError:
+                        continue
+                    out.write(json.dumps(finding) + "\n")
+                    out.flush()
+                    counts["findings"] += 1
+                    if on_finding:
+                        on_finding(finding)
+
+        async def drain(proc):
+            if proc is not None:
+                async for _ in proc.stdout:
+                    pass
+
+        try:
+            subfinder = await spawn("subfinder", "-d", self.target, "-silent")
+            httpx = await spawn("httpx", "-mc", "200,302,403", "-silent", stdin=True)
+            # -stream: scan hosts as they arrive instead of reading stdin to EOF first
+            nuclei = await spawn("nuclei", "-t", "cves/", "-jsonl", "-silent", "-stream", stdin=True)
+            katana = await spawn(
+                "katana", "-silent", "-o", os.path.join(self.output_dir, "endpoints.txt"),
+                stdin=True,
+            )
+
+            await asyncio.wait_for(
+                asyncio.gather(subdomains_to_httpx(), live_to_nuclei(),
+                               collect_findings(), drain(katana)),
+                timeout=timeout,
+            )
+            for proc in procs:
+                await proc.wait()
+        except asyncio.TimeoutError:
+            print(f"⏱️ Streaming pipeline exceeded {timeout}s on {self.target} — killed")
+        finally:
+            # never leave a tool (or anything it spawned) behind
+            for proc in procs:
+                if proc.returncode is None:
+                    kill_process_group(proc)
+                    await proc.wait()
+
+        return {"counts": counts, "files": paths}
+
+    def run_streaming_scan(self, on_finding=None):
+        """
+        Overlap all stages: every subdomain goes straight into a long-lived
+        httpx process and every live host straight into nuclei. Findings are
+        parsed from nuclei's JSON lines as they arrive (on_finding callback)
+        and written to disk instead of being buffered.
+        """
+        print("🚀 Starting streaming scan pipeline...\n")
+        summary = asyncio.run(self._stream_pipeline(on_finding))
+        c = summary["counts"]
+        print(f"[+] {c['subdomains']} subdomains → {c['live_hosts']} live → {c['findings']} findings")
+        print("✅ Streaming scan completed successfully.")
+        return summary
+
     # ----------------------------
     # Full Cycle Execution
     # ----------------------------
-    def run_full_scan(self):
+    def run_full_scan(self, streaming=False):
+        if streaming:
+            return self.run_streaming_scan()
+
         print("🚀 Starting full autonomous scan cycle...\n")
         self.enumerate_subdomains()
         self.probe_http()
@@ -5,57 +5,164 @@
 # ---------------------------------------------------------------
 
 import os
-import json
 import time
+import heapq
+import threading
 from datetime import datetime
-from learning_brain import (
-    suggest_priority_targets,
-    suggest_hotspot_signatures,
-    suggest_hot_technologies
-)
+from core.state_store import get_state_store
+from core.checkpoint import ResumeLedger, TARGET_DONE
+from core.worker_pool import WarmWorkerPool, POOL_WORKERS
+from learning_brain import HEAT_STREAM, get_brain_store
 
-STATE_FILE = "data/state.json"
 TARGET_FILE = "data/targets/global_500_targets.txt"
+CURSOR_NS = "scheduler.cursor"     # target → {"cycle", "ts"} (one row per target)
+SCAN_LEDGER = "data/state/scheduler_ledger.jsonl"   # written by this process only, read on restart
 
 
-def load_state():
-    """Load last scan state (where it stopped)."""
-    if not os.path.exists(STATE_FILE):
-        return {"last_index": 0}
-    with open(STATE_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def save_state(state):
-    """Save current scan state."""
-    with open(STATE_FILE, "w", encoding="utf-8") as f:
-        json.dump(state, f, indent=4)
-
-
-def load_targets():
+def load_targets(path=TARGET_FILE):
     """Load all 500+ targets."""
-    with open(TARGET_FILE, "r", encoding="utf-8") as f:
+    with open(path, "r", encoding="utf-8") as f:
         return [x.strip() for x in f if x.strip()]
 
 
-def get_priority_targets():
-    """Mix priority companies with normal list."""
-    priority = suggest_priority_targets(limit=50)
-    normal = load_targets()
-
-    final_list = []
-
-    # Add priority first
-    for p in priority:
-        if p in normal:
-            final_list.append(p)
-
-    # Add rest
-    for n in normal:
-        if n not in final_list:
-            final_list.append(n)
+class SmartScheduler:
+    """
+    Long-lived priority scheduler.
+    Heap entries are (cycle, -heat, last_scan_ts, seq, target):
+    every target is handed out once per cycle, hottest first, and
+    among equally hot targets the one scanned longest ago wins.
+    Heat changes push a fresh entry; superseded ones are skipped lazily.
+    """
 
-    return final_list
+    def __init__(self, target_file=TARGET_FILE):
+        self.target_file = target_file
+        self.store = get_state_store()
+        self.lock = threading.Lock()
+        self.heap = []
+        self.seq = 0
+        self.entry = {}        # target → seq of its live heap entry
+        self.cycle = {}        # target → cycle it will next be scanned in
+        self.last_scan = {}    # target → ts
+        self.targets_mtime = None
+        self.current_cycle = self.store.get("scheduler", "cycle", 0)
+        self.picked_in_cycle = 0
+
+        self.heat = get_brain_store().counters("brain.company_heat")
+        self.heat_cursor = self.store.last_event_id(HEAT_STREAM)
+        for target, cur in self.store.items(CURSOR_NS).items():
+            self.cycle[target] = cur["cycle"]
+            self.last_scan[target] = cur["ts"]
+        self._reload_targets()
+        self.picked_in_cycle = sum(1 for t in self.entry if self.cycle[t] > self.current_cycle)
+
+    # --- heap maintenance ---
+    def _key(self, target):
+        self.seq += 1
+        self.entry[target] = self.seq
+        return (self.cycle.get(target, 0), -self.heat.get(target, 0),
+                self.last_scan.get(target, 0), self.seq, target)
+
+    def _push(self, target):
+        heapq.heappush(self.heap, self._key(target))
+
+    def _rebuild(self):
+        """Drop stale entries: O(n) heapify."""
+        self.heap = [self._key(t) for t in list(self.entry)]
+        heapq.heapify(self.heap)
+
+    def _reload_targets(self):
+        """(Re)load the target file when it changed; new targets join the current cycle."""
+        try:
+            mtime = os.stat(self.target_file).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self.targets_mtime:
+            return
+        self.targets_mtime = mtime
+        targets = load_targets(self.target_file)
+
+        # new targets join the cycle in progress; a target re-added after a
+        # few cycles away is clamped to it too, instead of owing old cycles
+        self.entry = {}
+        cur = self.current_cycle
+        for target in targets:
+            self.cycle[target] = max(self.cycle.get(target, cur), cur)
+            self.entry[target] = None
+        self._rebuild()
+
+    def _follow_heat(self):
+        """Apply heat deltas recorded by learning_brain since the last tick."""
+        for event_id, deltas in self.store.events_since(HEAT_STREAM, self.heat_cursor):
+            self.heat_cursor = event_id
+            for target, delta in deltas.items():
+                self.heat[target] = self.heat.get(target, 0) + delta
+                if target in self.entry:
+                    self._push(target)
+        if len(self.heap) > 2 * len(self.entry) + 64:
+            self._rebuild()
+
+    # --- public API ---
+    def next_target(self):
+        """Pop the next target (O(log n)); returns (target, position_in_cycle, total)."""
+        with self.lock:
+            self._reload_targets()
+            self._follow_heat()
+
+            while self.heap:
+                cycle, _, _, seq, target = heapq.heappop(self.heap)
+                if self.entry.get(target) == seq:
+                    break
+            else:
+                raise RuntimeError("no targets to schedule")
+
+            cycle = max(cycle, self.current_cycle)   # the cycle never moves backwards
+            if cycle != self.current_cycle:
+                self.current_cycle = cycle
+                self.picked_in_cycle = 0
+                self.store.set("scheduler", "cycle", cycle)
+            self.picked_in_cycle += 1
+
+            now = time.time()
+            self.cycle[target] = cycle + 1
+            self.last_scan[target] = now
+            self._push(target)
+            self.store.set(CURSOR_NS, target, {"cycle": cycle + 1, "ts": now})
+
+            return target, self.picked_in_cycle, len(self.entry)
+
+    def requeue_unfinished(self, ledger):
+        """
+        After a restart: targets handed out this cycle with no completion
+        recorded since (the run died mid-scan) are handed out again.
+        """
+        with self.lock:
+            requeued = []
+            for target in self.entry:
+                if self.cycle[target] != self.current_cycle + 1:
+                    continue
+                done = ledger.get(target, TARGET_DONE)
+                if done and done["status"] == "done" and done["ts"] >= self.last_scan.get(target, 0):
+                    continue
+                self.cycle[target] = self.current_cycle
+                self._push(target)
+                self.store.set(CURSOR_NS, target,
+                               {"cycle": self.current_cycle, "ts": self.last_scan.get(target, 0)})
+                requeued.append(target)
+            self.picked_in_cycle -= len(requeued)
+            return requeued
+
+    def __len__(self):
+        return len(self.entry)
+
+
+_scheduler = None
+
+
+def get_scheduler():
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = SmartScheduler()
+    return _scheduler
 
 
 def smart_next_target():
@@ -64,20 +171,7 @@ def smart_next_target():
     - Resumes where it stopped last time.
     - If finished full cycle → restart, but with priority hot companies.
     """
-    targets = get_priority_targets()
-    total = len(targets)
-
-    state = load_state()
-    idx = state.get("last_index", 0)
-
-    if idx >= total:  # finished full cycle
-        idx = 0  # restart cycle
-
-    target = targets[idx]
-    state["last_index"] = idx + 1
-    save_state(state)
-
-    return target, idx + 1, total
+    return get_scheduler().next_target()
 
 
 def log(msg):
@@ -85,24 +179,42 @@ def log(msg):
     print(f"[{now}] {msg}")
 
 
-def run_scheduler():
+def _report(results, ledger):
+    for r in results:
+        if r["ok"]:
+            # workers return their stage records; only the scheduler writes them
+            ledger.apply((r["result"] or {}).get("records", []))
+            log(f"✅ {r['target']} done in {r['elapsed']:.1f}s (worker {r['pid']})")
+        else:
+            log(f"⚠️ {r['target']} failed: {r['error']}")
+
+
+def run_scheduler(workers=POOL_WORKERS):
     log("🔁 Starting Autonomous Smart Scheduler (v16)...")
 
-    while True:
-        try:
-            target, index, total = smart_next_target()
+    ledger = ResumeLedger(SCAN_LEDGER)
+    requeued = get_scheduler().requeue_unfinished(ledger)
+    if requeued:
+        log(f"↩ {len(requeued)} target(s) from the interrupted run will be scanned again")
+
+    # warm workers stay alive across targets (recycled every N tasks)
+    with WarmWorkerPool(workers=workers) as pool:
+        while True:
+            try:
+                target, index, total = smart_next_target()
 
-            log(f"🎯 Next Target [{index}/{total}] → {target}")
+                log(f"🎯 Next Target [{index}/{total}] → {target}")
 
-            # give target to scan engine
-            os.system(f"python3 scan_engine.py --single {target}")
+                # give target to a warm scan worker (waits while all are busy)
+                pool.submit(target)
+                _report(pool.drain(), ledger)
 
-        except Exception as e:
-            log(f"⚠️ Scheduler error: {e}")
-            time.sleep(300)   # wait 5 minutes before retry
+            except Exception as e:
+                log(f"⚠️ Scheduler error: {e}")
+                time.sleep(300)   # wait 5 minutes before retry
 
-        # wait before next target
-        time.sleep(2)
+            # wait before next target
+            time.sleep(2)
 
 
 if __name__ == "__main__":
@@ -6,6 +6,8 @@ import json
 import requests
 from datetime import datetime
 
+from core.intel_cache import cached_fetch
+
 class ThreatIntelEngine:
     def __init__(self):
         base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -53,7 +55,7 @@ class ThreatIntelEngine:
         print(f"🔎 Querying Shodan: {query}")
         try:
             url = f"https://api.shodan.io/shodan/host/search?key={self.shodan_api_key}&query={query}"
-            r = requests.get(url, timeout=20)
+            r = cached_fetch("shodan", query, url, timeout=20)
             if r.status_code == 200:
                 data = r.json()
                 path = os.path.join(self.intel_dir, "shodan_intel.json")
@@ -1,11 +1,13 @@
-import httpx
 import asyncio
 import socket
 import tldextract
 import json
 import re
-from bs4 import BeautifulSoup
 from concurrent.futures import ThreadPoolExecutor
+from core.dns_resolver import get_resolver, first_address
+from core.port_scanner import PortScanner, scan_ports
+from core import http_transport
+from core.html_extract import extract_scripts
 
 # -------------------------------------------------
 # Ultra Scan Engine — 10× Faster Vulnerability Radar
@@ -13,43 +15,24 @@ from concurrent.futures import ThreadPoolExecutor
 
 async def fetch(url):
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=8) as client:
-            r = await client.get(url)
-            return r.text, r.status_code
+        r = await http_transport.aget(url, timeout=8)
+        return r.text, r.status_code
     except:
         return None, None
 
 
-def port_scan(host):
-    open_ports = []
-    common_ports = [80, 443, 22, 21, 25, 53, 8080, 8443, 3306]
+COMMON_PORTS = [80, 443, 22, 21, 25, 53, 8080, 8443, 3306]
 
-    for p in common_ports:
-        try:
-            s = socket.socket()
-            s.settimeout(0.4)
-            s.connect((host, p))
-            open_ports.append(p)
-            s.close()
-        except:
-            pass
 
-    return open_ports
+def port_scan(host):
+    return scan_ports(host, COMMON_PORTS, timeout=0.4)["open_ports"]
 
 
 def extract_js_urls(html, domain):
     if not html:
         return []
 
-    soup = BeautifulSoup(html, "lxml")
-    urls = []
-
-    for tag in soup.find_all("script"):
-        src = tag.get("src")
-        if src and domain in src:
-            urls.append(src)
-
-    return urls
+    return [src for src in extract_scripts(html) if domain in src]
 
 
 async def ultra_scan(domain):
@@ -95,8 +78,11 @@ async def ultra_scan(domain):
     # 3) Port Scan
     host = extracted.registered_domain
     try:
-        ip = socket.gethostbyname(domain)
-        open_ports = port_scan(ip)
+        ip = first_address(await get_resolver().resolve(domain))
+        if not ip:
+            raise socket.gaierror(domain)
+        scan = await PortScanner(timeout=0.4).scan_host(ip, COMMON_PORTS)
+        open_ports = scan["open_ports"]
 
         results.append({
             "target": domain,
@@ -1,5 +1,6 @@
 import json, os, time
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 from recon.passive_recon import passive_recon
 from recon.deep_crawler import deep_crawl
@@ -9,6 +10,9 @@ from modules.shadow_recon import shadow_recon
 from modules.mobile_api_recon import mobile_api_recon
 from modules.auto_chain_exploit import chain_exploit
 from ai.zeroday_predictor import predict_zeroday
+from core.checkpoint import ResumeLedger, RecordBuffer
+from core.stage_dag import StageDAG, stage_commit
+from core.deadline import get_run_deadline, CostEstimator
 
 # ---------------------------------------------------
 # CONFIG
@@ -16,11 +20,23 @@ from ai.zeroday_predictor import predict_zeroday
 
 DISCORD = os.getenv("DISCORD_WEBHOOK_URL")
 TARGET_FILE = "data/targets/global_500_targets.txt"
-SAVE_FILE = "data/state/resume.json"
+LEDGER_FILE = "data/state/unified_ledger.jsonl"
+STAGE_DIR = "data/state/stages"
 REPORT_DIR = "data/reports"
 LOG = "data/logs/unified.log"
 
-os.makedirs("data/state", exist_ok=True)
+# targets scanned concurrently (each also runs its stages in parallel)
+MAX_IN_FLIGHT = int(os.getenv("UNIFIED_IN_FLIGHT", "6"))
+
+# a pass shorter than this (nothing left to scan, every target failing) is
+# followed by a pause that doubles on each consecutive short pass
+MIN_PASS_SECONDS = 60
+MAX_IDLE_SLEEP = 1800
+
+# per-stage timeouts (seconds); a timed-out stage contributes its empty default
+STAGE_TIMEOUTS = {"passive": 300, "active": 420, "crawl": 420, "shadow": 240, "mobile": 240}
+
+os.makedirs(STAGE_DIR, exist_ok=True)
 os.makedirs("data/logs", exist_ok=True)
 os.makedirs("data/reports", exist_ok=True)
 
@@ -34,17 +50,37 @@ def log(x):
         f.write(f"[{t}] {x}\n")
     print(x)
 
-def save_progress(idx):
-    with open(SAVE_FILE, "w") as f:
-        json.dump({"idx": idx}, f)
-
-def load_progress():
-    if not os.path.exists(SAVE_FILE):
-        return 0
-    try:
-        return json.load(open(SAVE_FILE))["idx"]
-    except:
-        return 0
+_ledger = None
+
+def get_ledger():
+    """The resume ledger, opened on first use (pool workers never open it)."""
+    global _ledger
+    if _ledger is None:
+        _ledger = ResumeLedger(LEDGER_FILE)
+    return _ledger
+
+def run_stage(domain, name, fn, ledger=None):
+    """Run a stage once per cycle; a resumed run reloads the saved result instead."""
+    ledger = ledger or get_ledger()
+    ref = ledger.result_ref(domain, name)
+    if ledger.is_done(domain, name) and ref and os.path.exists(ref):
+        try:
+            with open(ref) as f:
+                log(f"↪ {domain}: stage '{name}' already done")
+                return json.load(f)
+        except:
+            pass
+
+    result = fn()
+    ref = f"{STAGE_DIR}/{domain.replace('.', '_')}.{name}.json"
+    with stage_commit() as live:
+        if not live:
+            log(f"⏱ {domain}: stage '{name}' finished after its timeout — result discarded")
+            return result
+        with open(ref, "w") as f:
+            json.dump(result, f)
+        ledger.record(domain, name, "done", ref)
+    return result
 
 def send_discord(msg):
     if not DISCORD:
@@ -59,39 +95,8 @@ def send_discord(msg):
 # MAIN ENGINE
 # ---------------------------------------------------
 
-def scan_target(domain):
-
-    log(f"🔍 SCANNING → {domain}")
-
-    output = {
-        "domain": domain,
-        "time": datetime.utcnow().isoformat(),
-        "findings": []
-    }
-
-    # Passive
-    p = passive_recon(domain)
-    output["passive"] = p
-
-    # Active
-    a = active_recon(domain)
-    output["active"] = a
-
-    # Crawler
-    urls = deep_crawl(domain)
-    output["urls"] = urls
-
-    # Shadow
-    shadow = shadow_recon(domain)
-    output["shadow"] = shadow
-
-    # Mobile
-    mobile = mobile_api_recon(domain)
-    output["mobile"] = mobile
-
-    # Fingerprint
-    fp = fingerprint(a.get("httpx", ""))
-
+def build_findings(domain, urls):
+    """Heuristic findings from crawled URLs, scored and chained."""
     # Simulated nuclei
     findings = []
     for u in urls[:40]:
@@ -127,6 +132,48 @@ def scan_target(domain):
             "details": c["description"]
         })
 
+    return findings
+
+
+def scan_target(domain, ledger=None):
+
+    log(f"🔍 SCANNING → {domain}")
+    ledger = ledger or get_ledger()
+
+    output = {
+        "domain": domain,
+        "time": datetime.utcnow().isoformat(),
+        "findings": []
+    }
+
+    # Recon stages are independent; findings only needs the crawl
+    budget = get_run_deadline().budget
+    dag = StageDAG(domain)
+    dag.add("passive", lambda r: run_stage(domain, "passive", lambda: passive_recon(domain), ledger),
+            timeout=budget(STAGE_TIMEOUTS["passive"]), default={})
+    dag.add("active", lambda r: run_stage(domain, "active", lambda: active_recon(domain), ledger),
+            timeout=budget(STAGE_TIMEOUTS["active"]), default={})
+    dag.add("crawl", lambda r: run_stage(domain, "crawl", lambda: deep_crawl(domain), ledger),
+            timeout=budget(STAGE_TIMEOUTS["crawl"]), default=[])
+    dag.add("shadow", lambda r: run_stage(domain, "shadow", lambda: shadow_recon(domain), ledger),
+            timeout=budget(STAGE_TIMEOUTS["shadow"]), default=[])
+    dag.add("mobile", lambda r: run_stage(domain, "mobile", lambda: mobile_api_recon(domain), ledger),
+            timeout=budget(STAGE_TIMEOUTS["mobile"]), default=[])
+    dag.add("fingerprint", lambda r: fingerprint((r["active"] or {}).get("httpx", "")),
+            deps=["active"], default={})
+    dag.add("findings", lambda r: build_findings(domain, r["crawl"] or []),
+            deps=["crawl"], default=[])
+    r = dag.run()
+
+    output["passive"] = r["passive"]
+    output["active"] = r["active"]
+    output["urls"] = r["crawl"]
+    output["shadow"] = r["shadow"]
+    output["mobile"] = r["mobile"]
+    output["fingerprint"] = r["fingerprint"]
+    output["stage_times"] = {k: round(v, 2) for k, v in dag.timings.items()}
+    findings = r["findings"]
+
     # Filter CRITICAL / HIGH / MEDIUM
     filtered = [f for f in findings if f["severity"] in ["CRITICAL", "HIGH", "MEDIUM"]]
 
@@ -135,6 +182,11 @@ def scan_target(domain):
     # Save report
     fname = f"{REPORT_DIR}/{domain.replace('.', '_')}.json"
     json.dump(output, open(fname, "w"), indent=2)
+    if dag.errors:
+        # keep the target open: finished stages are reused on the next pass
+        log(f"⚠️ {domain}: incomplete stages {sorted(dag.errors)}")
+    else:
+        ledger.mark_target_done(domain, fname)
 
     # Discord summary
     if len(filtered) > 0:
@@ -144,25 +196,89 @@ def scan_target(domain):
 
     return True
 
+
+def scan_cycle_target(domain):
+    """
+    Worker-pool entrypoint: always a fresh scan (no stage is reused from an
+    earlier cycle) and the ledger records go back to the parent to write.
+    """
+    buffer = RecordBuffer()
+    scan_target(domain, ledger=buffer)
+    return {"records": buffer.records}
+
 # ---------------------------------------------------
 # LOOP
 # ---------------------------------------------------
 
-def main():
-
-    domains = [x.strip() for x in open(TARGET_FILE) if x.strip()]
-    start = load_progress()
-
-    log(f"▶ Resuming from index {start}...")
-    for idx in range(start, len(domains)):
-        save_progress(idx)
-        scan_target(domains[idx])
-        time.sleep(1)
-
-    # after finishing → restart stronger
-    os.remove(SAVE_FILE)
-    send_discord("♻ All targets scanned — restarting cycle stronger.")
-    main()
+def run_pass(domains, max_in_flight=MAX_IN_FLIGHT, deadline=None, estimator=None):
+    """
+    Scan every not-yet-done domain, keeping up to max_in_flight targets running.
+    Stops admitting targets once the expected cost no longer fits the run
+    deadline; returns False if the pass was cut short.
+    """
+    deadline = deadline or get_run_deadline()
+    estimator = estimator or CostEstimator()
+    ledger = get_ledger()
+    done = ledger.completed_targets()
+    pending = iter([d for d in domains if d not in done])
+    log(f"▶ Resuming: {len(done & set(domains))}/{len(domains)} targets already done...")
+
+    complete = True
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        running = {}
+        while True:
+            while complete and len(running) < max_in_flight:
+                if not deadline.can_admit(estimator.estimate):
+                    log(f"⏳ {deadline.remaining():.0f}s left < ~{estimator.estimate:.0f}s per target — "
+                        f"not admitting more targets")
+                    complete = False
+                    break
+                domain = next(pending, None)
+                if domain is None:
+                    break
+                running[pool.submit(scan_target, domain)] = (domain, time.monotonic())
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                domain, started = running.pop(future)
+                estimator.observe(time.monotonic() - started)
+                try:
+                    future.result()
+                except Exception as e:
+                    log(f"❌ {domain} failed: {e}")
+
+    ledger.compact()
+    return complete
+
+
+def main(max_in_flight=MAX_IN_FLIGHT):
+
+    deadline = get_run_deadline()
+    estimator = CostEstimator(initial=max(STAGE_TIMEOUTS.values()) / 2)
+
+    idle = MIN_PASS_SECONDS
+    while True:
+        started = time.monotonic()
+        domains = [x.strip() for x in open(TARGET_FILE) if x.strip()]
+        if not run_pass(domains, max_in_flight, deadline, estimator):
+            # out of time: progress is already in the ledger and reports
+            log("🛑 Run deadline reached — progress saved, resuming next run.")
+            return
+
+        # after finishing → restart stronger (next cycle, no recursion)
+        get_ledger().reset()
+        send_discord("♻ All targets scanned — restarting cycle stronger.")
+
+        # never spin: back off while passes finish without real work
+        elapsed = time.monotonic() - started
+        if elapsed >= MIN_PASS_SECONDS:
+            idle = MIN_PASS_SECONDS
+            continue
+        pause = max(0.0, min(idle, deadline.remaining()))
+        log(f"💤 Pass took {elapsed:.0f}s — waiting {pause:.0f}s before the next cycle")
+        time.sleep(pause)
+        idle = min(idle * 2, MAX_IDLE_SLEEP)
 
 
 if __name__ == "__main__":
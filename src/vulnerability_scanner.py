@@ -4,28 +4,24 @@
 # Mission: Scan crawled URLs for common security issues.
 # ============================================================
 
-import re
 import concurrent.futures
-import requests
+
+from core import http_transport
+from core.signature_matcher import SignatureMatcher
 
 COMMON_VULN_PATTERNS = {
-    "xss": [r"<script>", r"alert\(", r"onerror="],
-    "sql_injection": [r"'", r"\" OR 1=1", r"UNION SELECT"],
-    "open_redirect": [r"redirect=", r"next=", r"url="]
+    "xss": ["<script>", "alert(", "onerror="],
+    "sql_injection": ["'", "\" OR 1=1", "UNION SELECT"],
+    "open_redirect": ["redirect=", "next=", "url="]
 }
+VULN_MATCHER = SignatureMatcher(COMMON_VULN_PATTERNS)
 
 def scan_single_url(url):
     """Simple passive vulnerability pattern matcher."""
     findings = []
     try:
-        response = requests.get(url, timeout=6)
-        body = response.text.lower()
-
-        for vuln_type, patterns in COMMON_VULN_PATTERNS.items():
-            for p in patterns:
-                if re.search(p.lower(), body):
-                    findings.append(vuln_type)
-                    break
+        response = http_transport.get(url, timeout=6)
+        findings = VULN_MATCHER.categories(response.text)
     except Exception:
         pass
 
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run in an empty directory with fresh per-process state singletons."""
+    import core.state_store
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(core.state_store, "_shared_store", None)
+    return tmp_path
@@ -0,0 +1,159 @@
+import socket
+import threading
+import time
+import types
+from collections import Counter
+
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+import pytest
+
+import core.dns_resolver as dns_resolver
+from core.dns_resolver import AsyncDNSResolver, DNSCache, bulk_resolve, filter_resolvable
+
+
+class StubDNSServer:
+    """
+    Local UDP DNS server.
+    records: {(name, "A"|"AAAA"): ([addresses], ttl)}; names in `nxdomain`
+    answer NXDOMAIN, (name, type) pairs in `drop` never get an answer.
+    """
+
+    def __init__(self, records=None, nxdomain=(), drop=()):
+        self.records = dict(records or {})
+        self.nxdomain = set(nxdomain)
+        self.drop = set(drop)
+        self.queries = Counter()
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.1)
+        self.port = self.sock.getsockname()[1]
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        while not self.stopped.is_set():
+            try:
+                wire, addr = self.sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            query = dns.message.from_wire(wire)
+            q = query.question[0]
+            name = q.name.to_text().rstrip(".")
+            rdtype = dns.rdatatype.to_text(q.rdtype)
+            self.queries[name, rdtype] += 1
+            if (name, rdtype) in self.drop:
+                continue
+            response = dns.message.make_response(query)
+            if name in self.nxdomain:
+                response.set_rcode(dns.rcode.NXDOMAIN)
+            elif (name, rdtype) in self.records:
+                addresses, ttl = self.records[name, rdtype]
+                response.answer.append(
+                    dns.rrset.from_text(name + ".", ttl, "IN", rdtype, *addresses))
+            self.sock.sendto(response.to_wire(), addr)
+
+    def close(self):
+        self.stopped.set()
+        self.thread.join()
+        self.sock.close()
+
+
+@pytest.fixture
+def stub():
+    server = StubDNSServer(
+        records={
+            ("www.example.test", "A"): (["10.0.0.1"], 120),
+            ("www.example.test", "AAAA"): (["fd00::1"], 120),
+            ("v4only.example.test", "A"): (["10.0.0.2"], 120),
+            ("slow.example.test", "A"): (["10.0.0.3"], 120),
+        },
+        nxdomain={"gone.example.test"},
+        drop={("slow.example.test", "AAAA"), ("flaky.example.test", "A")},
+    )
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(dns_resolver, "time", types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def resolver(stub, workdir, monkeypatch):
+    r = AsyncDNSResolver(nameservers=["127.0.0.1"], port=stub.port, timeout=0.2,
+                         cache=DNSCache(str(workdir / "dns_cache.json")))
+    monkeypatch.setattr(dns_resolver, "_shared_resolver", r)
+    return r
+
+
+def test_bulk_resolve_against_stub(resolver):
+    results = bulk_resolve(["WWW.example.test.", "v4only.example.test", "gone.example.test"])
+    assert results["www.example.test"]["a"] == ["10.0.0.1"]
+    assert results["www.example.test"]["aaaa"] == ["fd00::1"]
+    assert results["v4only.example.test"]["a"] == ["10.0.0.2"]
+    assert results["gone.example.test"]["a"] == []
+
+
+def test_filter_resolvable_drops_nxdomain(resolver):
+    names = ["www.example.test", "gone.example.test", "v4only.example.test"]
+    assert filter_resolvable(names) == ["www.example.test", "v4only.example.test"]
+
+
+def test_cache_hit_then_expiry(resolver, stub, clock):
+    bulk_resolve(["www.example.test"])
+    bulk_resolve(["www.example.test"])
+    assert stub.queries["www.example.test", "A"] == 1       # second lookup was a cache hit
+
+    clock[0] += 121                                          # past the 120s record TTL
+    bulk_resolve(["www.example.test"])
+    assert stub.queries["www.example.test", "A"] == 2
+
+
+def test_cache_persists_across_instances(resolver, stub, workdir):
+    bulk_resolve(["www.example.test"])
+    fresh = DNSCache(str(workdir / "dns_cache.json"))
+    assert fresh.get("www.example.test")["a"] == ["10.0.0.1"]
+
+
+def test_negative_answer_is_cached(resolver, stub):
+    bulk_resolve(["gone.example.test"])
+    bulk_resolve(["gone.example.test"])
+    assert stub.queries["gone.example.test", "A"] == 1
+
+
+def test_partial_failure_is_not_cached(resolver, stub):
+    # A answers but AAAA times out → usable now, but retried next time
+    first = bulk_resolve(["slow.example.test"])
+    assert first["slow.example.test"]["a"] == ["10.0.0.3"]
+    assert resolver.cache.get("slow.example.test") is None
+
+    # A times out while AAAA is an empty answer → no negative entry either
+    bulk_resolve(["flaky.example.test"])
+    assert resolver.cache.get("flaky.example.test") is None
+    bulk_resolve(["flaky.example.test"])
+    assert stub.queries["flaky.example.test", "AAAA"] == 2
+
+
+def test_concurrent_saves(resolver):
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(5):
+                bulk_resolve(["www.example.test", "v4only.example.test"])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
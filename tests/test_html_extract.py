@@ -0,0 +1,19 @@
+from core.html_extract import extract_page
+
+
+def test_non_ascii_text_survives():
+    html = ('<html><head><title>Café – Ñoño 日本</title>'
+            '<script>var s = "ü";</script></head>'
+            '<body><a href="/straße?q=日本">x</a></body></html>')
+    page = extract_page(html)
+    assert page["title"] == "Café – Ñoño 日本"
+    assert page["links"] == ["/straße?q=日本"]
+
+
+def test_str_wins_over_meta_charset():
+    html = '<meta charset="iso-8859-1"><title>Ñoño</title>'
+    assert extract_page(html)["title"] == "Ñoño"
+
+
+def test_empty_page():
+    assert extract_page("") == {"links": [], "scripts": [], "forms": [], "title": None}
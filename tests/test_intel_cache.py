@@ -0,0 +1,151 @@
+import json
+import threading
+import types
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import core.intel_cache as intel_cache
+from core.intel_cache import IntelCache, cached_fetch, SOURCE_TTLS
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+class IntelHandler(BaseHTTPRequestHandler):
+    """
+    /etag   → JSON with an ETag, 304 on a matching If-None-Match
+    /lm     → JSON with Last-Modified, 304 on a matching If-Modified-Since
+    /down   → 500 (source outage)
+    """
+    hits = Counter()
+    conditional = Counter()
+    down = False
+
+    def do_GET(self):
+        cls = type(self)
+        cls.hits[self.path] += 1
+        if cls.down:
+            self.send_response(500)
+            self.end_headers()
+            return
+        if self.path == "/etag" and self.headers.get("If-None-Match") == ETAG:
+            cls.conditional[self.path] += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        if self.path == "/lm" and self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+            cls.conditional[self.path] += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = json.dumps({"path": self.path, "n": cls.hits[self.path]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if self.path == "/etag":
+            self.send_header("ETag", ETAG)
+        if self.path == "/lm":
+            self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    IntelHandler.hits = Counter()
+    IntelHandler.conditional = Counter()
+    IntelHandler.down = False
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), IntelHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(intel_cache, "time", types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def cache(workdir, clock):
+    return IntelCache(str(workdir / "intel.db"))
+
+
+def test_fresh_hit_skips_network(server, cache):
+    first = cached_fetch("crtsh", "a.com", server + "/etag", cache=cache)
+    second = cached_fetch("crtsh", "a.com", server + "/etag", cache=cache)
+    assert not first.from_cache and second.from_cache
+    assert second.json() == first.json()
+    assert IntelHandler.hits["/etag"] == 1
+
+
+def test_headers_case_insensitive_on_miss_and_hit(server, cache):
+    for _ in range(2):     # network miss, then cache hit
+        resp = cached_fetch("crtsh", "a.com", server + "/etag", cache=cache)
+        assert resp.headers.get("Content-Type") == "application/json"
+        assert resp.headers.get("content-type") == "application/json"
+        assert "json" in resp.headers.get("Content-Type", "")
+
+
+def test_ttl_expiry_revalidates_with_etag(server, cache, clock):
+    cached_fetch("crtsh", "a.com", server + "/etag", cache=cache)
+    clock[0] += SOURCE_TTLS["crtsh"] + 1
+
+    resp = cached_fetch("crtsh", "a.com", server + "/etag", cache=cache)
+    assert resp.from_cache
+    assert IntelHandler.conditional["/etag"] == 1
+
+    # the 304 refreshed the entry: fresh again, no further request
+    cached_fetch("crtsh", "a.com", server + "/etag", cache=cache)
+    assert IntelHandler.hits["/etag"] == 2
+
+
+def test_ttl_expiry_revalidates_with_last_modified(server, cache, clock):
+    cached_fetch("crtsh", "b.com", server + "/lm", cache=cache)
+    clock[0] += SOURCE_TTLS["crtsh"] + 1
+    resp = cached_fetch("crtsh", "b.com", server + "/lm", cache=cache)
+    assert resp.from_cache
+    assert IntelHandler.conditional["/lm"] == 1
+    assert cache.get("crtsh", "b.com")["fresh"]
+
+
+def test_stale_entry_served_when_source_is_down(server, cache, clock):
+    first = cached_fetch("crtsh", "a.com", server + "/etag", cache=cache)
+    clock[0] += SOURCE_TTLS["crtsh"] + 1
+    IntelHandler.down = True
+    resp = cached_fetch("crtsh", "a.com", server + "/etag", cache=cache)
+    assert resp.from_cache and resp.status_code == 200
+    assert resp.json() == first.json()
+
+
+def test_lru_eviction(workdir, clock):
+    cache = IntelCache(str(workdir / "lru.db"), max_bytes=300)
+    for q in ("a", "b", "c"):
+        clock[0] += 1
+        cache.put("whois", q, "x" * 100)
+    clock[0] += 1
+    cache.get("whois", "a")                 # a is now the most recently used
+    clock[0] += 1
+    cache.put("whois", "d", "x" * 100)      # over the limit → evict b (oldest)
+
+    assert cache.get("whois", "b") is None
+    assert all(cache.get("whois", q) for q in ("a", "c", "d"))
+    assert cache.total == 300
+
+
+def test_replacing_an_entry_keeps_the_running_total(workdir, clock):
+    cache = IntelCache(str(workdir / "lru.db"), max_bytes=1000)
+    cache.put("whois", "a", "x" * 100)
+    cache.put("whois", "a", "x" * 40)
+    assert cache.total == 40
+    assert IntelCache(str(workdir / "lru.db")).total == 40
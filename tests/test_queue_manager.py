@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+
+from core.queue_manager import TaskQueue, TimerWheel
+
+
+@pytest.fixture
+def wheel():
+    w = TimerWheel(tick=3600, slots=8)      # the thread never reaches a tick...
+    w.stop()                                # ...and is stopped; tests tick by hand
+    return w
+
+
+def fired_after(wheel, ticks_wanted, limit=40):
+    fired = []
+    wheel.schedule(ticks_wanted * wheel.tick, lambda: fired.append(True))
+    for n in range(1, limit + 1):
+        wheel._advance()
+        if fired:
+            return n
+    return None
+
+
+@pytest.mark.parametrize("ticks", [1, 2, 7, 8, 9, 16, 17, 24])
+def test_timer_fires_on_exact_tick(wheel, ticks):
+    assert fired_after(wheel, ticks) == ticks
+
+
+def test_timer_from_a_moved_cursor(wheel):
+    for _ in range(5):
+        wheel._advance()
+    assert fired_after(wheel, 8) == 8
+    assert fired_after(wheel, 3) == 3
+
+
+def test_sub_tick_delay_fires_on_next_tick(wheel):
+    assert fired_after(wheel, 0.01) == 1
+
+
+def test_retry_then_success():
+    attempts = []
+
+    def flaky():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise ValueError("boom")
+
+    q = TaskQueue(max_workers=2, retries=2, backoff=0.05)
+    q.add_task(flaky)
+    assert q.wait_completion(timeout=5)
+    q.close()
+    stats = q.stats()
+    assert len(attempts) == 3
+    assert stats["succeeded"] == 1 and stats["retried"] == 2 and stats["failed"] == 0
+
+
+def test_timeout_counts_and_gives_up():
+    release = threading.Event()
+    q = TaskQueue(max_workers=1, retries=0)
+    q.add_task(lambda: release.wait(5), timeout=0.1)
+    assert q.wait_completion(timeout=5)
+    release.set()
+    q.close()
+    stats = q.stats()
+    assert stats["timeouts"] == 1 and stats["failed"] == 1
+
+
+def test_priority_order():
+    order = []
+    gate = threading.Event()
+    q = TaskQueue(max_workers=1)
+    q.add_task(lambda: gate.wait(5), priority=0)     # occupy the only worker
+    time.sleep(0.05)
+    q.add_task(lambda: order.append("low"), priority=10)
+    q.add_task(lambda: order.append("high"), priority=0)
+    gate.set()
+    q.close()
+    assert order == ["high", "low"]
@@ -0,0 +1,68 @@
+import os
+from collections import Counter
+
+from core.checkpoint import ResumeLedger
+from smart_scheduler import SmartScheduler
+
+_stamp = [1_000_000_000]
+
+
+def write_targets(path, targets):
+    path.write_text("\n".join(targets) + "\n")
+    _stamp[0] += 10                      # distinct mtime on every rewrite
+    os.utime(path, ns=(_stamp[0] * 10**9, _stamp[0] * 10**9))
+
+
+def picks(scheduler, n):
+    return [scheduler.next_target() for _ in range(n)]
+
+
+def test_every_target_once_per_cycle(workdir):
+    path = workdir / "targets.txt"
+    write_targets(path, ["a.com", "b.com", "c.com"])
+    s = SmartScheduler(str(path))
+    for _ in range(3):
+        got = picks(s, 3)
+        assert sorted(t for t, _, _ in got) == ["a.com", "b.com", "c.com"]
+        assert [i for _, i, _ in got] == [1, 2, 3]
+
+
+def test_readded_target_is_not_handed_out_repeatedly(workdir):
+    path = workdir / "targets.txt"
+    write_targets(path, ["a.com", "b.com", "c.com"])
+    s = SmartScheduler(str(path))
+    picks(s, 3)
+
+    # c.com drops out for a few cycles...
+    write_targets(path, ["a.com", "b.com"])
+    picks(s, 8)
+    cycle_before = s.current_cycle
+
+    # ...and comes back: it joins the current cycle, it does not owe old ones
+    write_targets(path, ["a.com", "b.com", "c.com"])
+    got = picks(s, 6)
+    assert Counter(t for t, _, _ in got) == {"a.com": 2, "b.com": 2, "c.com": 2}
+    assert s.current_cycle >= cycle_before
+
+
+def test_cycle_survives_restart(workdir):
+    path = workdir / "targets.txt"
+    write_targets(path, ["a.com", "b.com", "c.com"])
+    first = picks(SmartScheduler(str(path)), 2)
+
+    rest = SmartScheduler(str(path)).next_target()
+    assert rest[0] not in {t for t, _, _ in first}
+    assert rest[1] == 3
+
+
+def test_restart_requeues_targets_without_a_completion(workdir):
+    path = workdir / "targets.txt"
+    write_targets(path, ["a.com", "b.com", "c.com"])
+    ledger = ResumeLedger(str(workdir / "ledger.jsonl"))
+    handed = [t for t, _, _ in picks(SmartScheduler(str(path)), 2)]
+    ledger.mark_target_done(handed[0])          # handed[1] was still scanning when the run died
+
+    restarted = SmartScheduler(str(path))
+    assert restarted.requeue_unfinished(ledger) == [handed[1]]
+    rest = sorted(t for t, _, _ in picks(restarted, 2))
+    assert rest == sorted({"a.com", "b.com", "c.com"} - {handed[0]})